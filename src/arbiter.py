@@ -0,0 +1,155 @@
+import asyncio
+import functools
+import itertools
+import time
+from concurrent.futures import Executor
+from dataclasses import dataclass, field
+from typing import Dict, Any, Callable, Optional
+
+from config import logging
+
+
+class ActionDelays:
+    """
+    Per-action settle delays replacing a blanket pyautogui.PAUSE.
+    Actions whose effect can be observed on screen (the wallet popup,
+    claiming, page navigation) are measured with measure() and their delay
+    follows a moving average of the observed UI response time; the rest
+    keep the old 1.5s pause until they are measured too.
+    """
+    DEFAULTS = {
+        "move": 1.5,
+        "click": 1.5,
+        "double_click": 1.5,
+        "scroll": 1.5,
+        "hotkey": 1.5,
+        "typewrite": 1.5,
+        "wallet_popup": 3.0,
+        "wallet_ready": 0.5,  # After the popup shows, before its buttons take clicks
+        "claim": 3.0,
+        "navigate": 3.0,
+    }
+
+    def __init__(self, alpha: float = 0.3, margin: float = 1.25, minimum: float = 0.05):
+        self.alpha = alpha
+        self.margin = margin
+        self.minimum = minimum
+        self._estimates: Dict[str, float] = {}
+
+    def delay(self, action: str) -> float:
+        if action in self._estimates:
+            return max(self.minimum, self._estimates[action] * self.margin)
+        return self.DEFAULTS.get(action, self.DEFAULTS["click"])
+
+    def record(self, action: str, seconds: float) -> None:
+        previous = self._estimates.get(action)
+        self._estimates[action] = seconds if previous is None else previous + self.alpha * (seconds - previous)
+        logging.debug(f"UI response for {action}: {seconds:.2f}s, delay now {self.delay(action):.2f}s")
+
+    def settle(self, action: str) -> None:
+        time.sleep(self.delay(action))
+
+    def measure(self, action: str, probe: Callable[[], bool], poll: float = 0.1) -> float:
+        """
+        Wait until probe() reports the UI has responded, recording how long
+        it took. Gives up after twice the current delay without recording.
+        """
+        timeout = 2 * max(self.delay(action), self.DEFAULTS.get(action, 0))
+        start = time.time()
+        while True:
+            elapsed = time.time() - start
+            if probe():
+                self.record(action, elapsed)
+                return elapsed
+            if elapsed >= timeout:
+                break
+            # Probe once more at the deadline rather than sleeping past it
+            time.sleep(min(poll, timeout - elapsed))
+        logging.warning(f"No UI response to {action} within {timeout:.1f}s")
+        return timeout
+
+
+ACTION_DELAYS = ActionDelays()
+
+
+class Priority:
+    CLAIM = 0  # Time critical, rewards can be lost while waiting
+    START = 1
+    NAVIGATE = 2
+    CHECK = 3
+
+
+@dataclass(order=True)
+class QueuedMacro:
+    priority: int
+    sequence: int
+    name: str = field(compare=False)
+    miner: str = field(compare=False)
+    fn: Callable = field(compare=False)
+    future: asyncio.Future = field(compare=False)
+    enqueued_at: float = field(compare=False, default_factory=time.time)
+
+
+class InputArbiter:
+    """
+    Serialises input macros for one display lane.
+    Each macro runs atomically on the executor; waiting macros are served
+    by priority, then in submission order. How long each macro queued is
+    recorded per macro name.
+    """
+
+    def __init__(self, executor: Optional[Executor] = None, name: str = "desktop"):
+        self.executor = executor
+        self.name = name
+        self._queue: "asyncio.PriorityQueue[QueuedMacro]" = asyncio.PriorityQueue()
+        self._sequence = itertools.count()
+        self._worker: Optional[asyncio.Task] = None
+        self.wait_stats: Dict[str, Dict[str, float]] = {}
+
+    def start(self) -> None:
+        if self._worker is None:
+            self._worker = asyncio.create_task(self._run(), name=f"input-{self.name}")
+
+    async def stop(self) -> None:
+        if self._worker is not None:
+            self._worker.cancel()
+            await asyncio.gather(self._worker, return_exceptions=True)
+            self._worker = None
+
+    async def submit(self, name: str, miner: str, fn: Callable, *args,
+                     priority: int = Priority.NAVIGATE, **kwargs) -> Any:
+        """Queue a macro and wait for its result"""
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put(QueuedMacro(priority, next(self._sequence), name, miner,
+                                          functools.partial(fn, *args, **kwargs), future))
+        return await future
+
+    def _record_wait(self, name: str, waited: float) -> None:
+        stats = self.wait_stats.setdefault(name, {"count": 0, "total": 0.0, "max": 0.0})
+        stats["count"] += 1
+        stats["total"] += waited
+        stats["max"] = max(stats["max"], waited)
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            macro = await self._queue.get()
+            if macro.future.cancelled():
+                continue
+            waited = time.time() - macro.enqueued_at
+            self._record_wait(macro.name, waited)
+            logging.debug(f"{macro.miner}: {macro.name} waited {waited:.2f}s for input on {self.name}")
+            try:
+                result = await loop.run_in_executor(self.executor, macro.fn)
+            except Exception as e:
+                if not macro.future.cancelled():
+                    macro.future.set_exception(e)
+            else:
+                if not macro.future.cancelled():
+                    macro.future.set_result(result)
+
+    def summary(self) -> str:
+        return ", ".join(
+            f"{name}: {stats['count']}x avg {stats['total'] / stats['count']:.2f}s max {stats['max']:.2f}s"
+            for name, stats in sorted(self.wait_stats.items())
+        )
@@ -0,0 +1,80 @@
+import threading
+import time
+from typing import Dict, Optional
+
+from config import logging
+
+
+class CooldownPlanner:
+    """
+    Works out when each miner can restart after a cooldown.
+    Elapsed cooldown comes from the last claim recorded in the database and
+    the page's time-waited timer, and wakeups are spread at least min_gap
+    seconds apart so claims from different miners don't all hit the input
+    lane at once.
+    """
+
+    def __init__(self, cooldown: float = 1200, min_gap: float = 30):
+        self.cooldown = cooldown
+        self.min_gap = min_gap
+        self.wakeups: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def reconcile(db_elapsed: Optional[float], screen_elapsed: Optional[float]) -> Optional[float]:
+        """
+        The on-screen timer is authoritative but coarse ("5m", "1h"). Use the
+        precise database figure when it falls inside the timer's resolution,
+        otherwise trust the screen.
+        """
+        if screen_elapsed is None:
+            return db_elapsed
+        if db_elapsed is None:
+            return screen_elapsed
+        resolution = 3600 if screen_elapsed >= 3600 else 60 if screen_elapsed >= 60 else 1
+        if screen_elapsed <= db_elapsed < screen_elapsed + resolution:
+            return db_elapsed
+        logging.info(f"Database cooldown ({db_elapsed:.0f}s) disagrees with the page ({screen_elapsed:.0f}s), using the page")
+        return screen_elapsed
+
+    def _stagger(self, miner_name: str, earliest: float) -> float:
+        others = sorted(wake_at for name, wake_at in self.wakeups.items() if name != miner_name)
+        wake_at = earliest
+        for other in others:
+            if abs(other - wake_at) < self.min_gap:
+                wake_at = other + self.min_gap
+        return wake_at
+
+    def plan(self, miner_name: str, db_elapsed: Optional[float] = None,
+             screen_elapsed: Optional[float] = None, now: Optional[float] = None,
+             cooldown: Optional[float] = None) -> float:
+        """Schedule the miner's wakeup and return the seconds to wait for it"""
+        now = time.time() if now is None else now
+        cooldown = self.cooldown if cooldown is None else cooldown
+        elapsed = self.reconcile(db_elapsed, screen_elapsed)
+        remaining = cooldown if elapsed is None else max(0.0, cooldown - elapsed)
+        with self._lock:
+            # Forget wakeups that have already passed
+            self.wakeups = {name: wake_at for name, wake_at in self.wakeups.items() if wake_at > now - self.min_gap}
+            wake_at = self._stagger(miner_name, now + remaining)
+            self.wakeups[miner_name] = wake_at
+        wait = wake_at - now
+        logging.info(f"{miner_name}: cooldown {remaining:.0f}s left, waking in {wait:.0f}s")
+        return wait
+
+    def next_wakeup(self, miner_name: str) -> Optional[float]:
+        return self.wakeups.get(miner_name)
+
+    def restore(self, miner_name: str, wake_at: float) -> None:
+        """Re-register a wakeup planned before a restart"""
+        with self._lock:
+            self.wakeups[miner_name] = wake_at
+
+    def release(self, miner_name: str) -> None:
+        """Drop the miner's wakeup once it has restarted mining"""
+        with self._lock:
+            self.wakeups.pop(miner_name, None)
+
+
+# Shared by every miner in the process so their wakeups can be staggered
+PLANNER = CooldownPlanner()
@@ -0,0 +1,99 @@
+import curses
+import time
+from typing import Dict, Any, Callable, List
+
+from status import FeedReader, DEFAULT_FEED_PATH
+
+COLUMNS = [
+    ("Miner", 14), ("State", 10), ("Hashrate", 10), ("Avg", 8), ("Unclaimed", 12),
+    ("Rate/h", 9), ("Wakeup", 8), ("Cooldown", 9), ("Claims", 7), ("Updated", 9), ("Last Error", 30),
+]
+
+
+def format_age(seconds: float) -> str:
+    seconds = max(0, int(seconds))
+    if seconds < 60:
+        return f"{seconds}s"
+    if seconds < 3600:
+        return f"{seconds // 60}m{seconds % 60:02d}s"
+    return f"{seconds // 3600}h{seconds % 3600 // 60:02d}m"
+
+
+def format_row(name: str, miner: Dict[str, Any], now: float) -> List[str]:
+    def number(value, fmt="{:.1f}"):
+        return "-" if value is None else fmt.format(value)
+
+    wakeup = miner.get("next_wakeup")
+    updated = miner.get("updated_at")
+    return [
+        name,
+        miner.get("state") or "-",
+        number(miner.get("hashrate")),
+        number(miner.get("avg_hashrate")),
+        number(miner.get("unclaimed"), "{:,.0f}"),
+        number(miner.get("reward_rate")),
+        format_age(wakeup - now) if wakeup and wakeup > now else "-",
+        number(miner.get("cooldown_count"), "{}"),
+        number(miner.get("claims"), "{}"),
+        format_age(now - updated) if updated else "-",
+        (miner.get("last_error") or "")[:30],
+    ]
+
+
+class Dashboard:
+    """
+    Live fleet view built from in-memory miner state. Only rows whose
+    rendered text changed are redrawn, and nothing is read from the
+    database, so refreshing stays cheap with many miners.
+    """
+
+    def __init__(self, screen, source: Callable[[], set], miners: Dict[str, Dict[str, Any]],
+                 interval: float = 1.0):
+        self.screen = screen
+        self.source = source
+        self.miners = miners
+        self.interval = interval
+        # Last text drawn on each screen row, by position
+        self._rows: Dict[int, List[str]] = {}
+
+    def _draw_cells(self, y: int, cells: List[str], attr: int = 0) -> None:
+        height, width = self.screen.getmaxyx()
+        if y >= height:
+            return
+        x = 0
+        for (_, column_width), cell in zip(COLUMNS, cells):
+            if x >= width - 1:
+                break
+            self.screen.addnstr(y, x, cell.ljust(column_width), min(column_width, width - 1 - x), attr)
+            x += column_width + 1
+
+    def draw(self, changed: set) -> None:
+        now = time.time()
+        names = sorted(self.miners)
+        if len(names) != len(self._rows):
+            self.screen.erase()
+            self._rows.clear()
+        self.screen.addnstr(0, 0, f"Pond miners: {len(names)}   {time.strftime('%H:%M:%S')}   q to quit",
+                            self.screen.getmaxyx()[1] - 1, curses.A_BOLD)
+        self._draw_cells(2, [title for title, _ in COLUMNS], curses.A_UNDERLINE)
+        for i, name in enumerate(names):
+            row = format_row(name, self.miners[name], now)
+            if self._rows.get(i) != row:
+                self._draw_cells(3 + i, row)
+                self._rows[i] = row
+        self.screen.refresh()
+
+    def run(self) -> None:
+        curses.curs_set(0)
+        self.screen.timeout(int(self.interval * 1000))
+        while True:
+            self.draw(self.source())
+            key = self.screen.getch()
+            if key in (ord('q'), ord('Q')):
+                return
+
+
+def run_dashboard(feed_path: str = DEFAULT_FEED_PATH, interval: float = 1.0) -> None:
+    """Follow the status feed written by running miners"""
+    reader = FeedReader(feed_path)
+    curses.wrapper(lambda screen: Dashboard(screen, reader.poll, reader.miners, interval).run())
@@ -1,7 +1,9 @@
+import os
+import json
 import sqlite3
 from datetime import datetime, timedelta
 import logging
-from typing import Optional, List, Tuple, Any
+from typing import Optional, List, Tuple, Any, Dict
 from dataclasses import dataclass
 from contextlib import contextmanager
 
@@ -100,15 +102,129 @@ class DatabaseManager:
                 """, (miner_name,))
             return cursor.fetchone()
 
+    def get_last_claim_time(self, miner_name: str) -> Optional[datetime]:
+        """End time of the miner's most recently finished session"""
+        with self.get_connection() as conn:
+            cursor = conn.execute("""
+                SELECT MAX(end_time) FROM mining_sessions
+                WHERE miner_name = ? AND end_time IS NOT NULL
+                """, (miner_name,))
+            end_time = cursor.fetchone()[0]
+            return datetime.fromisoformat(end_time) if end_time else None
+
+    def save_checkpoint(self, miner_name: str, state: Dict[str, Any]) -> None:
+        """Replace the miner's checkpoint in a single transaction"""
+        with self.get_connection() as conn:
+            conn.execute("""
+                INSERT OR REPLACE INTO miner_checkpoints (miner_name, state, updated_at)
+                VALUES (?, ?, ?)
+                """, (miner_name, json.dumps(state), datetime.now()))
+            conn.commit()
+
+    def load_checkpoint(self, miner_name: str) -> Optional[Dict[str, Any]]:
+        with self.get_connection() as conn:
+            row = conn.execute('SELECT state FROM miner_checkpoints WHERE miner_name = ?',
+                               (miner_name,)).fetchone()
+            return json.loads(row[0]) if row else None
+
+    def get_last_session(self, miner_name: str) -> Optional[Tuple]:
+        """The miner's most recently started session, running or finished"""
+        with self.get_connection() as conn:
+            cursor = conn.execute("""
+                SELECT session_id, start_time, cooldown_count FROM mining_sessions
+                WHERE miner_name = ?
+                ORDER BY start_time DESC LIMIT 1
+                """, (miner_name,))
+            return cursor.fetchone()
+
     def should_start_mining(self, miner_name: str) -> bool:
-        last_session = self.get_active_session(miner_name)
+        # A claim closes the session, so look at the latest one whether or
+        # not it has ended: if it was the last before a cooldown, wait
+        last_session = self.get_last_session(miner_name)
         if not last_session:
             return True
         
         # last_session is a tuple with (session_id, start_time, cooldown_count)
         _, _, cooldown_count = last_session
         return cooldown_count > 1  # only start mining if cooldown count > 1
-        
+
+    def merge_from(self, source_path: str, source_name: Optional[str] = None) -> int:
+        """
+        Incrementally merge another host's session database into this one.
+        Only rows added since the last merge of the same file are copied,
+        deduplicated on session_id, and sessions merged while still active
+        pick up their end time and rewards once the source has them.
+        Returns the number of new sessions merged.
+        """
+        source_path = os.path.abspath(source_path)
+        if not os.path.isfile(source_path):
+            raise FileNotFoundError(f"Database not found: {source_path}")
+        source_name = source_name or source_label(source_path)
+
+        with self.get_connection() as conn:
+            row = conn.execute('SELECT last_id FROM merged_sources WHERE source_path = ?',
+                               (source_path,)).fetchone()
+            last_id = row[0] if row else 0
+
+            conn.execute('ATTACH DATABASE ? AS src', (source_path,))
+            try:
+                cursor = conn.execute("""
+                    INSERT OR IGNORE INTO mining_sessions
+                    (miner_name, start_time, end_time, time_mined, rewards,
+                     cooldown_count, session_id, boost, source)
+                    SELECT miner_name, start_time, end_time, time_mined, rewards,
+                           cooldown_count, session_id, boost, ?
+                    FROM src.mining_sessions
+                    WHERE id > ?
+                    """, (source_name, last_id))
+                merged = cursor.rowcount
+
+                # Close sessions that were still active when they were first merged
+                conn.execute("""
+                    UPDATE mining_sessions
+                    SET (end_time, time_mined, rewards) = (
+                        SELECT s.end_time, s.time_mined, s.rewards
+                        FROM src.mining_sessions s
+                        WHERE s.session_id = mining_sessions.session_id)
+                    WHERE source = ? AND end_time IS NULL AND session_id IN (
+                        SELECT session_id FROM src.mining_sessions
+                        WHERE end_time IS NOT NULL AND id <= ?)
+                    """, (source_name, last_id))
+
+                max_id = conn.execute('SELECT MAX(id) FROM src.mining_sessions').fetchone()[0] or 0
+                conn.execute("""
+                    INSERT INTO merged_sources (source_path, source, last_id, merged_at)
+                    VALUES (?, ?, ?, ?)
+                    ON CONFLICT(source_path) DO UPDATE
+                    SET last_id = excluded.last_id, merged_at = excluded.merged_at
+                    """, (source_path, source_name, max(max_id, last_id), datetime.now()))
+                conn.commit()
+            finally:
+                conn.execute('DETACH DATABASE src')
+
+        logging.info(f"Merged {merged} new sessions from {source_name} ({source_path})")
+        return merged
+
+
+def source_label(source_path: str) -> str:
+    """Name a merged database after its file, or its directory for a default-named file"""
+    name = os.path.splitext(os.path.basename(source_path))[0]
+    if name == os.path.splitext(DBConfig.db_path)[0]:
+        name = os.path.basename(os.path.dirname(source_path)) or name
+    return name
+
+
+def find_databases(paths: List[str]) -> List[str]:
+    """Expand a list of database files and directories of *.db files"""
+    found = []
+    for path in paths:
+        if os.path.isdir(path):
+            found.extend(sorted(os.path.join(path, name) for name in os.listdir(path)
+                                if name.endswith('.db')))
+        else:
+            found.append(path)
+    return found
+
 
 # Keep MIGRATIONS as a module-level constant
 MIGRATIONS = [
@@ -153,5 +269,23 @@ MIGRATIONS = [
     DROP TABLE mining_sessions;
     ALTER TABLE mining_sessions_new RENAME TO mining_sessions;
     COMMIT;
+    """,
+
+    # Migration 2: Track which host a session came from when merging databases
+    """
+    ALTER TABLE mining_sessions ADD COLUMN source TEXT;
+    CREATE TABLE IF NOT EXISTS merged_sources
+    (source_path TEXT PRIMARY KEY,
+     source TEXT,
+     last_id INTEGER,
+     merged_at TIMESTAMP);
+    """,
+
+    # Migration 3: Checkpointed in-memory state of each miner, for resuming after a restart
+    """
+    CREATE TABLE IF NOT EXISTS miner_checkpoints
+    (miner_name TEXT PRIMARY KEY,
+     state TEXT,
+     updated_at TIMESTAMP);
     """
 ]
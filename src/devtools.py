@@ -0,0 +1,303 @@
+import argparse
+import base64
+import json
+import os
+import socket
+import struct
+import time
+import urllib.parse
+import urllib.request
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Any, List, Optional
+
+from config import MINING_URL, logging
+
+DEFAULT_DEVTOOLS_PORT = 9222
+
+# Visible button labels on the miner page, overridable per miner with
+# "devtools": {"buttons": {...}}
+DEFAULT_BUTTON_TEXT = {
+    "mine": "mine",
+    "mine_again": "mine again",
+    "claim": "claim",
+    # The MINE tile on the home page that links to the miner page
+    "miner_link": "mine",
+}
+
+CLICK_BY_TEXT_JS = '''
+(function(label) {
+    label = label.toLowerCase();
+    const candidates = Array.from(document.querySelectorAll('button, a, [role="button"]'));
+    const match = candidates.find(el => el.innerText.trim().toLowerCase() === label)
+        || candidates.find(el => el.innerText.trim().toLowerCase().includes(label));
+    if (!match) return false;
+    match.click();
+    return true;
+})
+'''
+
+
+class WebSocket:
+    """
+    Minimal RFC 6455 client, just enough to speak the DevTools protocol
+    over a local connection without adding a dependency.
+    """
+
+    def __init__(self, url: str, timeout: float = 10):
+        parsed = urllib.parse.urlparse(url)
+        self._sock = socket.create_connection((parsed.hostname, parsed.port or 80), timeout)
+        key = base64.b64encode(os.urandom(16)).decode()
+        self._sock.sendall((
+            f"GET {parsed.path} HTTP/1.1\r\n"
+            f"Host: {parsed.netloc}\r\n"
+            "Upgrade: websocket\r\n"
+            "Connection: Upgrade\r\n"
+            f"Sec-WebSocket-Key: {key}\r\n"
+            "Sec-WebSocket-Version: 13\r\n\r\n"
+        ).encode())
+        response = b""
+        while not response.endswith(b"\r\n\r\n"):
+            chunk = self._sock.recv(1)
+            if not chunk:
+                raise ConnectionError("DevTools connection closed during handshake")
+            response += chunk
+        if b" 101 " not in response.split(b"\r\n", 1)[0]:
+            raise ConnectionError(f"DevTools handshake failed: {response.decode(errors='replace')}")
+
+    def _read_exact(self, size: int) -> bytes:
+        data = b""
+        while len(data) < size:
+            chunk = self._sock.recv(size - len(data))
+            if not chunk:
+                raise ConnectionError("DevTools connection closed")
+            data += chunk
+        return data
+
+    def _send_frame(self, opcode: int, payload: bytes) -> None:
+        header = bytearray([0x80 | opcode])
+        if len(payload) < 126:
+            header.append(0x80 | len(payload))
+        elif len(payload) < 1 << 16:
+            header.append(0x80 | 126)
+            header += struct.pack("!H", len(payload))
+        else:
+            header.append(0x80 | 127)
+            header += struct.pack("!Q", len(payload))
+        # Client frames must be masked
+        mask = os.urandom(4)
+        masked = bytes(byte ^ mask[i % 4] for i, byte in enumerate(payload))
+        self._sock.sendall(bytes(header) + mask + masked)
+
+    def send(self, text: str) -> None:
+        self._send_frame(0x1, text.encode())
+
+    def recv(self) -> str:
+        message = b""
+        while True:
+            first, second = self._read_exact(2)
+            opcode = first & 0x0F
+            length = second & 0x7F
+            if length == 126:
+                length = struct.unpack("!H", self._read_exact(2))[0]
+            elif length == 127:
+                length = struct.unpack("!Q", self._read_exact(8))[0]
+            payload = self._read_exact(length)
+            if opcode == 0x8:
+                raise ConnectionError("DevTools connection closed by browser")
+            if opcode == 0x9:
+                self._send_frame(0xA, payload)
+                continue
+            if opcode in (0x0, 0x1, 0x2):
+                message += payload
+                if first & 0x80:
+                    return message.decode()
+
+    def close(self) -> None:
+        try:
+            self._send_frame(0x8, b"")
+        finally:
+            self._sock.close()
+
+
+class DevToolsPage:
+    """
+    A miner tab reached through the browser's remote debugging port
+    (start the browser with --remote-debugging-port=9222).
+    Reads and clicks happen in the page itself, so they take milliseconds
+    and never touch the shared mouse, keyboard or clipboard.
+    """
+
+    def __init__(self, port: int = DEFAULT_DEVTOOLS_PORT, host: str = "127.0.0.1",
+                 url_match: str = "pond0x.com", target_index: int = 0, timeout: float = 10):
+        self.port = port
+        self.host = host
+        self.url_match = url_match
+        self.target_index = target_index
+        self.timeout = timeout
+        self._ws: Optional[WebSocket] = None
+        self._next_id = 0
+
+    def list_targets(self) -> List[Dict[str, Any]]:
+        with urllib.request.urlopen(f"http://{self.host}:{self.port}/json", timeout=self.timeout) as response:
+            return [target for target in json.load(response) if target.get("type") == "page"]
+
+    def _connect(self) -> WebSocket:
+        if self._ws is None:
+            targets = [target for target in self.list_targets() if self.url_match in target.get("url", "")]
+            if len(targets) <= self.target_index:
+                raise Exception(f"No page matching {self.url_match} on devtools port {self.port}")
+            self._ws = WebSocket(targets[self.target_index]["webSocketDebuggerUrl"], self.timeout)
+        return self._ws
+
+    def close(self) -> None:
+        if self._ws is not None:
+            self._ws.close()
+            self._ws = None
+
+    def send(self, method: str, params: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """Send a protocol command and wait for its response, skipping events"""
+        ws = self._connect()
+        self._next_id += 1
+        command_id = self._next_id
+        try:
+            ws.send(json.dumps({"id": command_id, "method": method, "params": params or {}}))
+            while True:
+                message = json.loads(ws.recv())
+                if message.get("id") == command_id:
+                    break
+        except (OSError, ConnectionError):
+            # Drop the socket so the next call reconnects to the tab
+            self._ws = None
+            raise
+        if "error" in message:
+            raise Exception(f"DevTools {method} failed: {message['error'].get('message')}")
+        return message.get("result", {})
+
+    def evaluate(self, expression: str) -> Any:
+        result = self.send("Runtime.evaluate", {
+            "expression": expression,
+            "returnByValue": True,
+            "awaitPromise": True,
+        })
+        if "exceptionDetails" in result:
+            raise Exception(f"Page script failed: {result['exceptionDetails'].get('text')}")
+        return result["result"].get("value")
+
+    def current_url(self) -> str:
+        return self.evaluate("location.href")
+
+    def page_text(self, selector: str = "body") -> str:
+        return self.evaluate(f"(document.querySelector({json.dumps(selector)}) || document.body).innerText")
+
+    def click_text(self, label: str) -> bool:
+        return bool(self.evaluate(f"{CLICK_BY_TEXT_JS}({json.dumps(label)})"))
+
+    def navigate(self, url: str = MINING_URL) -> None:
+        """Navigate and return as soon as the document has loaded"""
+        self.send("Page.navigate", {"url": url})
+        deadline = time.time() + self.timeout
+        while time.time() < deadline:
+            try:
+                if self.evaluate("document.readyState") == "complete":
+                    return
+            except Exception:
+                pass  # The old document can disappear mid-evaluate
+            time.sleep(0.05)
+        logging.warning(f"Page did not finish loading {url} within {self.timeout} seconds")
+
+
+def page_for_miner(miner_config: Dict[str, Any]) -> Optional[DevToolsPage]:
+    """DevTools page for a miner with a "devtools" config block, otherwise None"""
+    devtools_config = miner_config.get("devtools")
+    if not devtools_config:
+        return None
+    return DevToolsPage(
+        port=devtools_config.get("port", DEFAULT_DEVTOOLS_PORT),
+        host=devtools_config.get("host", "127.0.0.1"),
+        url_match=devtools_config.get("url_match", "pond0x.com"),
+        target_index=devtools_config.get("target_index", 0),
+    )
+
+
+# A local stand-in for the home and miner pages, to check the protocol
+# client against a real browser without touching pond0x.com
+STANDIN_HOME = """<!DOCTYPE html>
+<html><head><title>pond0x stand-in</title></head>
+<body><h1>pond0x</h1><a href="/mining">MINE</a></body></html>
+"""
+
+STANDIN_MINING = """<!DOCTYPE html>
+<html><head><title>pond0x stand-in miner</title></head>
+<body>
+<a href="/">pond0x</a>
+<div id="panel">Status: <span id="status">Claiming</span>.<br>
+Hashrate: <span id="hashrate">0.00</span> H/s<br>
+Unclaimed: <span id="unclaimed">0.00</span><br>
+Boost: 1.00<br>
+Time: <span id="time">0:00:00</span></div>
+<button id="main">Mine</button>
+<script>
+let started = null;
+const pad = n => String(n).padStart(2, "0");
+function render() {
+    const mining = started !== null;
+    const seconds = mining ? Math.floor((Date.now() - started) / 1000) : 0;
+    document.getElementById("status").textContent = mining ? "Mining" : "Claiming";
+    document.getElementById("hashrate").textContent = mining ? "12.50" : "0.00";
+    document.getElementById("unclaimed").textContent = (seconds * 2).toFixed(2);
+    document.getElementById("time").textContent =
+        `${Math.floor(seconds / 3600)}:${pad(Math.floor(seconds / 60) % 60)}:${pad(seconds % 60)}`;
+    document.getElementById("main").textContent = mining ? "Stop & Claim" : "Mine";
+}
+document.getElementById("main").onclick = () => { started = started === null ? Date.now() : null; render(); };
+setInterval(render, 1000);
+render();
+</script>
+</body></html>
+"""
+
+
+class StandinHandler(BaseHTTPRequestHandler):
+    def do_GET(self) -> None:
+        body = (STANDIN_MINING if self.path.rstrip("/") == "/mining" else STANDIN_HOME).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format: str, *args: Any) -> None:
+        pass
+
+
+def serve_standin(port: int = 8765, host: str = "127.0.0.1") -> ThreadingHTTPServer:
+    """Serve the stand-in pages until the server is shut down"""
+    server = ThreadingHTTPServer((host, port), StandinHandler)
+    logging.info(f"Stand-in miner pages on http://{host}:{server.server_address[1]}/ and /mining")
+    return server
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Inspect a miner page over the DevTools protocol")
+    parser.add_argument("function", type=str, help="Function to run (targets/url/text/click/standin)")
+    parser.add_argument("--port", type=int, default=DEFAULT_DEVTOOLS_PORT, help="Remote debugging port")
+    parser.add_argument("--url-match", type=str, default="pond0x.com", help="Substring of the page URL")
+    parser.add_argument("--label", type=str, default="mine", help="Button or link text for click")
+    parser.add_argument("--standin-port", type=int, default=8765, help="Port for the stand-in pages")
+    args = parser.parse_args()
+
+    if args.function == "standin":
+        serve_standin(args.standin_port).serve_forever()
+
+    page = DevToolsPage(port=args.port, url_match=args.url_match)
+    if args.function == "targets":
+        for target in page.list_targets():
+            print(f"{target['id']} {target['url']}")
+    elif args.function == "url":
+        print(page.current_url())
+    elif args.function == "text":
+        print(page.page_text())
+    elif args.function == "click":
+        print(page.click_text(args.label))
+    else:
+        logging.error(f"Function {args.function} not found")
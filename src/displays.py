@@ -0,0 +1,226 @@
+import os
+import subprocess
+import threading
+import time
+from typing import Dict, Any, List, Optional, Tuple
+
+from PIL import ImageGrab, Image
+
+from arbiter import ACTION_DELAYS
+from config import MINER_BOX_SIZE, BROWSER_TAB_SIZE, logging
+
+DEFAULT_WINDOW_SIZE = {"width": 520, "height": 610}
+
+# pyautogui style key names to X keysym names
+KEYSYM_NAMES = {
+    "ctrl": "Control_L",
+    "shift": "Shift_L",
+    "alt": "Alt_L",
+    "enter": "Return",
+    "\n": "Return",
+    "\t": "Tab",
+    " ": "space",
+    ":": "colon",
+    "/": "slash",
+    ".": "period",
+    "-": "minus",
+    "_": "underscore",
+    "?": "question",
+    "=": "equal",
+    "&": "ampersand",
+}
+
+
+class VirtualDisplay:
+    """An Xvfb virtual framebuffer that miners can be packed onto"""
+
+    def __init__(self, name: str, width: int = 1920, height: int = 1080, depth: int = 24):
+        self.name = name
+        self.width = width
+        self.height = height
+        self.depth = depth
+        self._process: Optional[subprocess.Popen] = None
+
+    @property
+    def socket_path(self) -> str:
+        return f"/tmp/.X11-unix/X{self.name.lstrip(':').split('.')[0]}"
+
+    def start(self, timeout: float = 10) -> None:
+        if os.path.exists(self.socket_path):
+            logging.info(f"Display {self.name} is already running")
+            return
+        logging.info(f"Starting Xvfb on {self.name} ({self.width}x{self.height})")
+        self._process = subprocess.Popen(
+            ["Xvfb", self.name, "-screen", "0", f"{self.width}x{self.height}x{self.depth}", "-nolisten", "tcp"],
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+        )
+        deadline = time.time() + timeout
+        while not os.path.exists(self.socket_path):
+            if self._process.poll() is not None or time.time() > deadline:
+                self.stop()
+                raise Exception(f"Xvfb failed to start on {self.name}")
+            time.sleep(0.1)
+
+    def stop(self) -> None:
+        if self._process is not None:
+            self._process.terminate()
+            self._process.wait()
+            self._process = None
+
+
+class XDisplayLane:
+    """
+    Capture and input lane bound to a single X display.
+    Input goes through the XTEST extension on a dedicated connection, so
+    miners on different displays never share a cursor or keyboard.
+    """
+    modifier_key = "ctrl"
+
+    def __init__(self, display_name: str):
+        from Xlib import X, XK, display
+        from Xlib.ext import xtest
+
+        self.display_name = display_name
+        self.lock = threading.RLock()
+        self._X = X
+        self._XK = XK
+        self._xtest = xtest
+        self._display = display.Display(display_name)
+
+    def capture_scale(self) -> float:
+        return 1.0
+
+    def _settle(self, action: str) -> None:
+        self._display.sync()
+        ACTION_DELAYS.settle(action)
+
+    def grab(self) -> Image.Image:
+        return ImageGrab.grab(xdisplay=self.display_name)
+
+    def screenshot(self, region: Tuple[int, int, int, int]) -> Image.Image:
+        left, top, width, height = region
+        return ImageGrab.grab(bbox=(left, top, left + width, top + height), xdisplay=self.display_name)
+
+    def size(self) -> Tuple[int, int]:
+        screen = self._display.screen()
+        return screen.width_in_pixels, screen.height_in_pixels
+
+    def move_to(self, x: int, y: int) -> None:
+        with self.lock:
+            self._xtest.fake_input(self._display, self._X.MotionNotify, x=int(x), y=int(y))
+            self._settle("move")
+
+    def _press_button(self, button: int) -> None:
+        self._xtest.fake_input(self._display, self._X.ButtonPress, button)
+        self._xtest.fake_input(self._display, self._X.ButtonRelease, button)
+
+    def click(self, x: Optional[int] = None, y: Optional[int] = None, clicks: int = 1) -> None:
+        with self.lock:
+            if x is not None and y is not None:
+                self._xtest.fake_input(self._display, self._X.MotionNotify, x=int(x), y=int(y))
+            for _ in range(clicks):
+                self._press_button(1)
+            self._settle("click" if clicks == 1 else "double_click")
+
+    def double_click(self, x: Optional[int] = None, y: Optional[int] = None) -> None:
+        self.click(x, y, clicks=2)
+
+    def scroll(self, clicks: int) -> None:
+        # X11 maps wheel up/down to buttons 4 and 5
+        with self.lock:
+            button = 4 if clicks > 0 else 5
+            for _ in range(abs(clicks)):
+                self._press_button(button)
+            self._settle("scroll")
+
+    def _keycode(self, key: str) -> Tuple[int, bool]:
+        keysym = self._XK.string_to_keysym(KEYSYM_NAMES.get(key, key))
+        keycode = self._display.keysym_to_keycode(keysym)
+        if not keycode:
+            raise ValueError(f"No keycode for key: {key!r}")
+        needs_shift = self._display.keycode_to_keysym(keycode, 0) != keysym
+        return keycode, needs_shift
+
+    def hotkey(self, *keys: str) -> None:
+        with self.lock:
+            keycodes = [self._keycode(key)[0] for key in keys]
+            for keycode in keycodes:
+                self._xtest.fake_input(self._display, self._X.KeyPress, keycode)
+            for keycode in reversed(keycodes):
+                self._xtest.fake_input(self._display, self._X.KeyRelease, keycode)
+            self._settle("hotkey")
+
+    def typewrite(self, text: str) -> None:
+        with self.lock:
+            shift = self._keycode("shift")[0]
+            for char in text:
+                keycode, needs_shift = self._keycode(char)
+                if needs_shift:
+                    self._xtest.fake_input(self._display, self._X.KeyPress, shift)
+                self._xtest.fake_input(self._display, self._X.KeyPress, keycode)
+                self._xtest.fake_input(self._display, self._X.KeyRelease, keycode)
+                if needs_shift:
+                    self._xtest.fake_input(self._display, self._X.KeyRelease, shift)
+            self._settle("typewrite")
+
+    # Clipboard readers tried in order; each prints the CLIPBOARD selection
+    PASTE_COMMANDS = (
+        ["xclip", "-selection", "clipboard", "-out"],
+        ["xsel", "--clipboard", "--output"],
+    )
+
+    def paste(self) -> str:
+        """
+        Clipboard of this display. pyperclip would read the clipboard of
+        $DISPLAY, which belongs to whichever display the process started on.
+        """
+        env = dict(os.environ, DISPLAY=self.display_name)
+        for command in self.PASTE_COMMANDS:
+            try:
+                result = subprocess.run(command, env=env, capture_output=True, text=True, timeout=5)
+            except FileNotFoundError:
+                continue
+            return result.stdout if result.returncode == 0 else ""
+        raise Exception("Reading the clipboard of a virtual display needs xclip or xsel")
+
+
+def get_virtual_displays(config: Dict[str, Any]) -> List[VirtualDisplay]:
+    return [
+        VirtualDisplay(display["name"], display.get("width", 1920), display.get("height", 1080))
+        for display in config.get("displays", [])
+    ]
+
+
+def pack_miners(config: Dict[str, Any]) -> None:
+    """
+    Assign miners without a "display" to the declared virtual displays,
+    filling each display with a grid of browser windows before moving on to
+    the next. Offsets are computed the same way as miner_config.py does for
+    a calibrated window.
+    """
+    window_size = config.get("window_size", DEFAULT_WINDOW_SIZE)
+    width, height = window_size["width"], window_size["height"]
+
+    cells = []
+    for display in config.get("displays", []):
+        columns = display.get("width", 1920) // width
+        rows = display.get("height", 1080) // height
+        taken = sum(1 for miner in config["miners"] if miner.get("display") == display["name"])
+        cells.extend((display["name"], index % columns, index // columns)
+                     for index in range(taken, columns * rows))
+
+    for miner in config["miners"]:
+        if "display" in miner:
+            continue
+        if not cells:
+            raise Exception("Not enough virtual display space for all miners")
+        display_name, column, row = cells.pop(0)
+        left, top = column * width, row * height
+        miner["display"] = display_name
+        miner["window_box"] = {"left": left, "top": top, "width": width, "height": height}
+        miner["miner_window_offset"] = {
+            "x": left + (width - MINER_BOX_SIZE) // 2,
+            "y": top + BROWSER_TAB_SIZE,
+        }
+        logging.info(f"Packed {miner['name']} onto {display_name} at ({left}, {top})")
@@ -0,0 +1,79 @@
+import argparse
+import json
+import os
+import subprocess
+
+from config import MINING_URL, logging
+from displays import get_virtual_displays, pack_miners
+
+
+def launch_browser(command, miner_config):
+    """Open a browser window for a miner at its packed position on its display"""
+    box = miner_config["window_box"]
+    args = [part.format(url=MINING_URL, x=box["left"], y=box["top"],
+                        width=box["width"], height=box["height"], name=miner_config["name"])
+            for part in command]
+    env = dict(os.environ, DISPLAY=miner_config["display"])
+    logging.info(f"Launching browser for {miner_config['name']} on {miner_config['display']}")
+    return subprocess.Popen(args, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run miners on Xvfb virtual displays")
+    parser.add_argument("miner_numbers", type=int, nargs='*', help="Miners to run (defaults to all)")
+    parser.add_argument("--skip-cooldown", action="store_true", help="Skip waiting for the cooldown")
+    parser.add_argument("--db-path", type=str, default="mining_sessions.db", help="Path to the database file")
+    parser.add_argument("--config", type=str, default="mining_config.json", help="Path to the mining config")
+    parser.add_argument("--print-layout", action="store_true", help="Print the packed miner config and exit")
+    parser.add_argument("--status-port", type=int, help="Serve miner status as JSON on this local port")
+    args = parser.parse_args()
+
+    with open(args.config, 'r') as file:
+        raw_config = json.load(file)
+    pack_miners(raw_config)
+
+    if args.print_layout:
+        print(json.dumps(raw_config["miners"], indent=4))
+        return
+
+    displays = get_virtual_displays(raw_config)
+    if not displays:
+        raise Exception("No virtual displays declared under \"displays\" in the config")
+    for display in displays:
+        display.start()
+
+    # pyautogui connects to $DISPLAY on import, so it must be set before
+    # the mining modules are loaded
+    os.environ.setdefault("DISPLAY", displays[0].name)
+    import utils
+    from runtime import run_fleet
+    from db_utils import DatabaseManager
+    from status import FLEET, DEFAULT_FEED_PATH, serve_status
+
+    config = utils.load_config_from_json(args.config)
+    for miner, packed in zip(config["miners"], raw_config["miners"]):
+        miner.update({key: packed[key] for key in ("display", "window_box", "miner_window_offset")})
+
+    db_manager = DatabaseManager(args.db_path)
+    db_manager.init_db()
+    FLEET.enable_feed(DEFAULT_FEED_PATH)
+    if args.status_port:
+        serve_status(FLEET, args.status_port)
+
+    miner_numbers = args.miner_numbers or range(len(config["miners"]))
+    miner_configs = [config["miners"][miner_number] for miner_number in miner_numbers]
+    browsers = []
+    try:
+        if "browser_command" in raw_config:
+            browsers = [launch_browser(raw_config["browser_command"], miner_config)
+                        for miner_config in miner_configs]
+        run_fleet(miner_configs, args.skip_cooldown, db_manager)
+    finally:
+        for browser in browsers:
+            browser.terminate()
+        for display in displays:
+            display.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,129 @@
+from dataclasses import dataclass
+from typing import Dict, Any, Tuple
+import copy
+
+from config import MINER_BOX_SIZE, logging
+
+# Every position below is measured relative to the top-left corner of the
+# miner box, on a reference box that is `box_size` logical pixels wide.
+DEFAULT_PROFILE: Dict[str, Any] = {
+    "box_size": MINER_BOX_SIZE,
+    "points": {
+        "mine": {"x": 200, "y": 315},
+        "mine_again": {"x": 200, "y": 300},
+        "logo": {"x": 65, "y": 33},
+        "confirm_in_wallet": {"x": 430, "y": 590},
+        "claim": {"x": 200, "y": 310},
+        "activate": {"x": 20, "y": 20},
+        "page_focus": {"x": 50, "y": 50},
+        "miner_link": {"x": 250, "y": 370},
+        "url_focus": {"x": 175, "y": 255},
+        "reload_focus": {"x": 150, "y": 250},
+    },
+    "regions": {
+        "status": {"x": 90, "y": 92, "w": 380, "h": 42},
+        "info": {"x": 50, "y": 90, "w": 380, "h": 130},
+        "time_waited": {"x": 433, "y": 328, "w": 60, "h": 26},
+    },
+}
+
+PROFILES: Dict[str, Dict[str, Any]] = {"default": DEFAULT_PROFILE}
+
+_resolved: Dict[Tuple, "MinerLayout"] = {}
+
+
+@dataclass
+class MinerLayout:
+    """Buttons and OCR regions of one miner, resolved to screen coordinates"""
+    profile: str
+    origin_x: int
+    origin_y: int
+    scale: float
+    capture_scale: float
+    points: Dict[str, Dict[str, int]]
+    regions: Dict[str, Dict[str, int]]
+
+    def point(self, name: str) -> Dict[str, int]:
+        """Absolute logical screen position of a button, usable as click_on_screen(**point)"""
+        if name not in self.points:
+            raise ValueError(f"Unknown button: {name}")
+        offset = self.points[name]
+        return {
+            "x": self.origin_x + round(offset["x"] * self.scale),
+            "y": self.origin_y + round(offset["y"] * self.scale),
+        }
+
+    def region(self, name: str) -> Tuple[int, int, int, int]:
+        """Absolute logical screen region (left, top, width, height) of an OCR area"""
+        if name not in self.regions:
+            raise ValueError(f"Unknown region: {name}")
+        region = self.regions[name]
+        return (
+            self.origin_x + round(region["x"] * self.scale),
+            self.origin_y + round(region["y"] * self.scale),
+            round(region["w"] * self.scale),
+            round(region["h"] * self.scale),
+        )
+
+    def capture_box(self, name: str) -> Tuple[int, int, int, int]:
+        """Region as a (left, top, right, bottom) crop box in captured image pixels"""
+        return self.scale_box(self.region(name))
+
+    def scale_box(self, region: Tuple[int, int, int, int]) -> Tuple[int, int, int, int]:
+        left, top, width, height = region
+        s = self.capture_scale
+        return (round(left * s), round(top * s), round((left + width) * s), round((top + height) * s))
+
+
+def register_profiles(profiles: Dict[str, Dict[str, Any]]) -> None:
+    """
+    Register layout profiles declared in mining_config.json.
+    Profiles only need to list what differs from the default one.
+    """
+    for name, profile in profiles.items():
+        merged = copy.deepcopy(DEFAULT_PROFILE)
+        merged["box_size"] = profile.get("box_size", merged["box_size"])
+        merged["points"].update(profile.get("points", {}))
+        merged["regions"].update(profile.get("regions", {}))
+        PROFILES[name] = merged
+        logging.debug(f"Registered layout profile {name}")
+    _resolved.clear()
+
+
+def resolve_layout(miner_config: Dict[str, Any], capture_scale: float = 1.0) -> MinerLayout:
+    """
+    Resolve a miner's layout once and cache it.
+    The cache key includes the window offset, so recalibrating a miner
+    produces a fresh layout.
+    """
+    profile_name = miner_config.get("layout", "default")
+    offset = miner_config["miner_window_offset"]
+    box_size = miner_config.get("miner_box_size", MINER_BOX_SIZE)
+    key = (miner_config.get("name"), profile_name, offset["x"], offset["y"], box_size, capture_scale)
+    if key in _resolved:
+        return _resolved[key]
+
+    if profile_name not in PROFILES:
+        raise ValueError(f"Unknown layout profile: {profile_name}")
+    profile = PROFILES[profile_name]
+
+    points = dict(profile["points"])
+    if "confirm_button_offset" in miner_config:
+        points["confirm_in_wallet"] = miner_config["confirm_button_offset"]
+
+    layout = MinerLayout(
+        profile=profile_name,
+        origin_x=offset["x"],
+        origin_y=offset["y"],
+        scale=box_size / profile["box_size"],
+        capture_scale=capture_scale,
+        points=points,
+        regions=dict(profile["regions"]),
+    )
+    _resolved[key] = layout
+    logging.debug(f"Resolved layout for {miner_config.get('name')}: {layout}")
+    return layout
+
+
+def clear_layout_cache() -> None:
+    _resolved.clear()
@@ -1,12 +1,18 @@
 import time
 import utils
 import argparse
-from typing import Dict, Any, Tuple, Optional
+from typing import Dict, Any, Optional
 import uuid
-import re
 from dataclasses import dataclass
 from config import logging
-from db_utils import DatabaseManager, DBConfig
+from db_utils import DatabaseManager, DBConfig, find_databases
+from snapshots import MinerSnapshot, SnapshotRing
+from cooldown import PLANNER
+from status import FLEET, DEFAULT_FEED_PATH, serve_status
+from arbiter import ACTION_DELAYS, Priority
+from steps import Sleep, Input, Call, Steps, run_steps
+from policy import PolicyContext, SessionHistory, RulePolicy, FixedDurationPolicy, YieldPolicy, backtest, build_policy
+import os
 import threading
 from datetime import datetime
 
@@ -18,75 +24,192 @@ class MiningState:
 
 @dataclass
 class MiningConfig:
-    BUTTON_OFFSETS = {
-        "mine": {"x": 200, "y": 315},
-        "mine_again": {"x": 200, "y": 300},
-        "logo": {"x": 65, "y": 33},
-        "confirm_in_wallet": {"x": 430, "y": 590},  # Default position
-        "claim": {"x": 200, "y": 310},
-    }
     COOLDOWN_WAIT_TIME: int = 1200  # 20 minutes in seconds
     MINING_CHECK_INTERVAL: int = 300  # 5 minutes in seconds
     GENERAL_WAIT_TIME: int = 6
     RETRY_WAIT_TIME: int = 30
     MIN_REWARD_THRESHOLD: float = 100.0
     STALL_CHECK_TIME: int = 1200  # 20 minutes in seconds
+    OCR_RECAPTURE_WAIT: int = 2  # Only used when every OCR variant failed
+    SNAPSHOT_HISTORY: int = 64  # Snapshots kept per miner, ~5 hours at the check interval
+    RESTART_OVERHEAD: int = 60  # Seconds lost claiming and starting a new session
+    CHECKPOINT_INTERVAL: int = 60  # Minimum seconds between routine checkpoints
+    RECENT_RATE_SNAPSHOTS: int = 3  # Check intervals the live reward rate is measured over
+    CHECKPOINT_MAX_AGE: int = 7200  # Checkpoints older than 2 hours are ignored on restart
+
+def cycle_overhead(mining_per_cooldown: int) -> float:
+    """Time a session costs beyond mining: restarting plus its share of the cooldown"""
+    return MiningConfig.RESTART_OVERHEAD + MiningConfig.COOLDOWN_WAIT_TIME / max(1, mining_per_cooldown)
 
 class MiningSession:
     def __init__(self, miner_config: Dict[str, Any], db_manager: DatabaseManager):
         self.miner_config = miner_config
         self.db = db_manager
+        self.lane = utils.get_lane(miner_config)
         self.session_id: Optional[str] = None
         self.reset_cooldown_count()
         self._lock = threading.Lock()
-        self.last_unclaimed = 0.0
-        self.last_unclaimed_time = 0  # Initialize to 0 instead of current time
-        self.time_since_unclaimed_change = 0
+        self.snapshots = SnapshotRing(MiningConfig.SNAPSHOT_HISTORY)
+        self.resume_wakeup: Optional[float] = None
+        self._last_checkpoint = 0.0
+        self._checkpoint = db_manager.load_checkpoint(miner_config["name"])
+        self.policy = build_policy(
+            miner_config.get("claim_policy", "rules"), db_manager, miner_config,
+            overhead=cycle_overhead(miner_config["mining_per_cooldown"]),
+            threshold=MiningConfig.MIN_REWARD_THRESHOLD,
+            stall_time=MiningConfig.STALL_CHECK_TIME,
+        )
         
     def reset_cooldown_count(self):
         self.cooldown_count: int = self.miner_config["mining_per_cooldown"]
 
+    @property
+    def resuming(self) -> bool:
+        return self._checkpoint is not None
+
+    def checkpoint(self, force: bool = False) -> None:
+        """Save the in-memory session state, at most every CHECKPOINT_INTERVAL unless forced"""
+        if self.resuming:
+            return  # Don't overwrite the last run's checkpoint before it is reconciled
+        now = time.time()
+        if not force and now - self._last_checkpoint < MiningConfig.CHECKPOINT_INTERVAL:
+            return
+        try:
+            self.db.save_checkpoint(self.miner_config["name"], {
+                "session_id": self.session_id,
+                "cooldown_count": self.cooldown_count,
+                "next_wakeup": PLANNER.next_wakeup(self.miner_config["name"]),
+                "snapshots": self.snapshots.dump(),
+                "saved_at": now,
+            })
+            self._last_checkpoint = now
+        except Exception as e:
+            logging.warning(f"Could not save checkpoint: {e}")
+
+    def resume(self, status: str) -> None:
+        """
+        Reconcile the checkpoint from the last run with what the page shows.
+        The cooldown count always carries over. A session still mining on
+        screen gets its session ID and snapshot history back, unless the
+        page's timer shows a newer session, and a miner in cooldown keeps
+        its planned wakeup instead of waiting the whole cooldown again.
+        The checkpoint is only consumed once the page shows mining or
+        cooldown and has been read, so a failed read retries next cycle.
+        """
+        checkpoint = self._checkpoint
+        if not checkpoint:
+            return
+        name = self.miner_config["name"]
+        age = time.time() - (checkpoint.get("saved_at") or 0)
+        if age > MiningConfig.CHECKPOINT_MAX_AGE:
+            logging.info(f"{name}: Ignoring checkpoint saved {age / 3600:.1f} hours ago")
+            self._checkpoint = None
+            return
+        if status not in (MiningState.MINING, MiningState.CLAIMING):
+            return
+
+        snapshots = checkpoint.get("snapshots", {}).get("snapshots", [])
+        screen_time = None
+        if status == MiningState.MINING and checkpoint.get("session_id") and snapshots:
+            screen_time = int(utils.get_miner_info(self.miner_config).get("time", 0))
+
+        self._checkpoint = None
+        self.cooldown_count = min(max(1, checkpoint.get("cooldown_count") or 1),
+                                  self.miner_config["mining_per_cooldown"])
+        if screen_time is not None:
+            last = MinerSnapshot(*snapshots[-1])
+            if screen_time >= last.time_mined:
+                self.session_id = checkpoint["session_id"]
+                self.snapshots.restore(checkpoint["snapshots"])
+                logging.info(f"{name}: Resumed session {self.session_id} with {len(self.snapshots)} snapshots")
+            else:
+                logging.info(f"{name}: The page shows a newer session than the checkpoint, starting fresh history")
+        elif status == MiningState.CLAIMING and checkpoint.get("next_wakeup"):
+            self.resume_wakeup = checkpoint["next_wakeup"]
+            logging.info(f"{name}: Resumed cooldown, waking in {max(0, self.resume_wakeup - time.time()):.0f}s")
+
+        FLEET.update(name, session_id=self.session_id, cooldown_count=self.cooldown_count)
+        self.checkpoint(force=True)
+
     def get_button_offset(self, button_name: str) -> Dict[str, int]:
-        """Get button offset with window position adjustment"""
-        if button_name not in MiningConfig.BUTTON_OFFSETS:
-            raise ValueError(f"Unknown button: {button_name}")
-            
-        # Use custom offset for confirm_in_wallet button
-        if button_name == "confirm_in_wallet" and "confirm_button_offset" in self.miner_config:
-            offset = self.miner_config["confirm_button_offset"]
-        else:
-            offset = MiningConfig.BUTTON_OFFSETS[button_name]
-            
-        return {
-            "x": self.miner_config["miner_window_offset"]["x"] + offset["x"],
-            "y": self.miner_config["miner_window_offset"]["y"] + offset["y"]
-        }
+        """Get button position from the miner's resolved layout"""
+        return utils.get_layout(self.miner_config).point(button_name)
 
     def activate_window(self):
-        x = self.miner_config["miner_window_offset"]["x"] + 20
-        y = self.miner_config["miner_window_offset"]["y"] + 20
         logging.info("Activate Window by clicking on it")
-        utils.click_on_screen(x, y, double_click=False)
+        utils.click_on_screen(**self.get_button_offset('activate'), double_click=False, lane=self.lane)
 
-    def start_mining(self) -> str:
-        """Start a new mining session"""
+    def go_home(self, double_click: bool = True) -> None:
+        """Activate the miner window and click the logo to return to the home page"""
+        baseline = utils.capture_region(utils.get_layout(self.miner_config), 'status', self.lane)
+        self.activate_window()
+        logo_btn_offset = self.get_button_offset('logo')
+        logging.info("Clicking Logo to go to home page")
+        utils.click_on_screen(**logo_btn_offset, double_click=double_click, lane=self.lane)
+        utils.wait_for_region_change(self.miner_config, 'status', baseline, 'navigate')
+
+    def click_mine(self) -> None:
         logging.info(f"Starting miner {self.miner_config['name']}")
-        
-        # Click mine button
-        mine_btn_offset = self.get_button_offset('mine')
         logging.info("Clicking Mine")
-        utils.click_on_screen(**mine_btn_offset)
-        time.sleep(3)
-        
-        # Confirm in wallet
+        utils.click_button(self.miner_config, 'mine', lane=self.lane)
+
+    def click_confirm(self) -> None:
         confirm_btn_offset = self.get_button_offset('confirm_in_wallet')
         logging.info("Clicking Confirm in Wallet")
-        utils.click_on_screen(**confirm_btn_offset)
-        time.sleep(MiningConfig.GENERAL_WAIT_TIME)
-        
-        # Verify mining started successfully
-        mining_info = utils.get_miner_info(self.miner_config)
+        utils.click_on_screen(**confirm_btn_offset, lane=self.lane)
+
+    def click_claim(self) -> None:
+        logging.info("Clicking Stop_And_Claim")
+        baseline = utils.capture_around(self.miner_config, 'claim')
+        utils.click_button(self.miner_config, 'claim', lane=self.lane)
+        # The button turns back into Mine once the claim has gone through
+        utils.wait_for_change(self.miner_config, 'claim', baseline, 'claim')
+
+    def mine_and_confirm(self) -> None:
+        """Click Mine, wait for the wallet popup to appear, then confirm it"""
+        baseline = utils.capture_around(self.miner_config, 'confirm_in_wallet')
+        self.click_mine()
+        utils.wait_for_change(self.miner_config, 'confirm_in_wallet', baseline, 'wallet_popup')
+        # The popup starts drawing before its buttons accept clicks
+        ACTION_DELAYS.settle('wallet_ready')
+        self.click_confirm()
+
+    def start_mining(self) -> str:
+        """Start a new mining session"""
+        return run_steps(self.start_mining_steps())
+
+    def start_mining_steps(self) -> Steps:
+        # Mine -> Confirm is one macro so no other miner steals focus while
+        # the wallet popup is opening
+        yield Input("mine_and_confirm", Priority.START, self.mine_and_confirm)
+        yield Sleep(MiningConfig.GENERAL_WAIT_TIME)
+        mining_info = yield Call(utils.get_miner_info, (self.miner_config,))
+        return (yield Call(self.record_session_start, (mining_info,)))
+
+    def goto_miner_page_steps(self) -> Steps:
+        yield Input("goto_miner_page", Priority.NAVIGATE, utils.goto_miner_page, (self.miner_config,))
+
+    def record_snapshot(self, mining_info: Dict[str, Any]) -> MinerSnapshot:
+        """Parse a reading once and add it to the miner's history"""
+        snapshot = MinerSnapshot.from_mining_info(mining_info)
+        self.snapshots.append(snapshot)
+        FLEET.update(
+            self.miner_config["name"],
+            hashrate=snapshot.hashrate,
+            avg_hashrate=self.snapshots.average_hashrate(),
+            unclaimed=snapshot.unclaimed,
+            reward_rate=self.snapshots.reward_rate(),
+            last_snapshot={slot: getattr(snapshot, slot) for slot in MinerSnapshot.__slots__},
+        )
+        self.checkpoint()
+        return snapshot
+
+    def record_session_start(self, mining_info: Dict[str, Any]) -> str:
+        """Verify mining started successfully and record the new session"""
         if mining_info.get('status', 'UNKNOWN') == "MINING":
+            if self.resuming:
+                logging.info(f"{self.miner_config['name']}: A new session replaces the unreconciled checkpoint")
+                self._checkpoint = None
             self.session_id = str(uuid.uuid4())
             self.db.start_mining_session(
                 self.miner_config["name"], 
@@ -94,32 +217,60 @@ class MiningSession:
                 self.cooldown_count,
                 boost=mining_info.get('boost', 0)
             )
-            # Initialize tracking variables after successful mining start
-            self.last_unclaimed = float(re.sub(r'[^\d.]', '', mining_info["unclaimed"]))
-            self.last_unclaimed_time = time.time()
-            self.time_since_unclaimed_change = 0
+            # The miner is no longer waiting, so stop staggering others around it
+            PLANNER.release(self.miner_config["name"])
+            self.resume_wakeup = None
+            # Start a fresh history for the new session
+            self.snapshots.clear()
+            self.record_snapshot(mining_info)
+            FLEET.update(self.miner_config["name"], state=MiningState.MINING, session_id=self.session_id,
+                         cooldown_count=self.cooldown_count, next_wakeup=None)
+            self.checkpoint(force=True)
             logging.info(f"Started new mining session: {self.session_id}")
             return self.session_id
         
         raise Exception("Miner is not mining")
 
-    def handle_claiming(self, skip_cooldown: bool) -> bool:
-        """Handle miner in claiming state"""
+    def cooldown_wait_time(self, read_screen: bool) -> float:
+        """Seconds until the cooldown ends, staggered against the other miners"""
+        screen_elapsed = None
+        if read_screen:
+            try:
+                screen_elapsed = utils.get_time_waited(self.miner_config)
+            except Exception as e:
+                logging.warning(f"Could not read time waited from the page: {e}")
+        last_claim = self.db.get_last_claim_time(self.miner_config["name"])
+        db_elapsed = (datetime.now() - last_claim).total_seconds() if last_claim else None
+        wait = PLANNER.plan(self.miner_config["name"], db_elapsed, screen_elapsed,
+                            cooldown=MiningConfig.COOLDOWN_WAIT_TIME)
+        FLEET.update(self.miner_config["name"], state="COOLDOWN",
+                     next_wakeup=PLANNER.next_wakeup(self.miner_config["name"]))
+        self.checkpoint(force=True)
+        return wait
+
+    def claiming_wait_time(self, skip_cooldown: bool) -> float:
+        """Seconds to wait before restarting a miner found in claiming state"""
         should_mine = self.db.should_start_mining(self.miner_config["name"])
+        # A resumed wakeup only applies to the first cooldown after a restart
+        wake_at, self.resume_wakeup = self.resume_wakeup, None
         
         # If should_mine is True, we can proceed immediately
         if should_mine or skip_cooldown:
             logging.info("Can start mining immediately")
-        else:
-            logging.info(f"Miner is claiming. Waiting for {MiningConfig.COOLDOWN_WAIT_TIME} seconds")
-            time.sleep(MiningConfig.COOLDOWN_WAIT_TIME)
-        
-        self.activate_window()
-        logo_btn_offset = self.get_button_offset('logo')
-        logging.info("Clicking Logo")
-        utils.click_on_screen(**logo_btn_offset)
-        time.sleep(MiningConfig.GENERAL_WAIT_TIME/2)
-        return True
+            return 0
+        if wake_at is not None and wake_at > time.time():
+            # Planned before a restart, the cooldown has been running since
+            PLANNER.restore(self.miner_config["name"], wake_at)
+            return wake_at - time.time()
+        wait = self.cooldown_wait_time(read_screen=True)
+        logging.info(f"Miner is claiming. Waiting for {wait:.0f} seconds")
+        return wait
+
+    def handle_claiming(self, skip_cooldown: bool) -> Steps:
+        """Handle miner in claiming state"""
+        yield Sleep((yield Call(self.claiming_wait_time, (skip_cooldown,))))
+        yield Input("go_home", Priority.NAVIGATE, self.go_home)
+        yield Sleep(MiningConfig.GENERAL_WAIT_TIME/2)
 
     def process_mining_rewards(self, mining_info: Dict[str, Any]) -> None:
         """Process and record mining rewards with proper session management"""
@@ -139,7 +290,8 @@ class MiningSession:
                     boost=mining_info.get('boost', 0)
                 )
             
-            rewards = float(re.sub(r'[^\d.]', '', mining_info["unclaimed"]))
+            latest = self.snapshots.latest
+            rewards = latest.unclaimed if latest else MinerSnapshot.from_mining_info(mining_info).unclaimed
             if rewards < MiningConfig.MIN_REWARD_THRESHOLD:
                 logging.info("Rewards are less than threshold. Saving to db as zero")
                 rewards = 0
@@ -156,114 +308,130 @@ class MiningSession:
             if self.cooldown_count == 0:
                 self.reset_cooldown_count()
             self.session_id = None  # Reset session_id after completion
+            FLEET.increment(self.miner_config["name"], "claims")
+            FLEET.update(self.miner_config["name"], state=MiningState.CLAIMING,
+                         session_id=None, cooldown_count=self.cooldown_count)
+            self.checkpoint(force=True)
 
-    def handle_mining(self) -> Tuple[bool, Optional[Dict[str, Any]]]:
-        """Handle miner in mining state"""
-        mining_info = self._get_valid_mining_info()
+    def handle_mining(self) -> Steps:
+        """Handle miner in mining state. Returns True once the session was claimed"""
+        mining_info = yield from self._get_valid_mining_info()
         if not mining_info:
-            return False, None
+            return False
 
-        if mining_info["hashrate"] == 0:
-            return self.stop_mining(mining_info)
-        
-        # Check for stalled mining (no increase in unclaimed rewards)
-        current_unclaimed = float(re.sub(r'[^\d.]', '', mining_info["unclaimed"]))
-        current_time = time.time()
-        
-        if current_unclaimed > 0 and current_unclaimed == self.last_unclaimed:
-            if self.time_since_unclaimed_change >= MiningConfig.STALL_CHECK_TIME:
-                logging.info(f"Mining appears stalled - no increase in unclaimed rewards for {MiningConfig.STALL_CHECK_TIME // 60} minutes")
-                return self.stop_mining(mining_info)
-            else:
-                self.time_since_unclaimed_change = (current_time - self.last_unclaimed_time)
-        else:
-            self.time_since_unclaimed_change = 0
-            self.last_unclaimed_time = current_time
-            self.last_unclaimed = current_unclaimed
+        if (yield Call(self.should_stop, (mining_info,))):
+            yield from self.stop_mining(mining_info)
+            return True
+
+        yield Sleep(MiningConfig.MINING_CHECK_INTERVAL)
+        return False
+
+    def should_stop(self, mining_info: Dict[str, Any]) -> bool:
+        """Decide whether to claim, recording the reading in the miner's history"""
+        snapshot = self.record_snapshot(mining_info)
+        claim, reason = self.policy.should_claim(PolicyContext(
+            elapsed=snapshot.time_mined,
+            unclaimed=snapshot.unclaimed,
+            hashrate=snapshot.hashrate,
+            reward_rate=self.snapshots.recent_reward_rate(MiningConfig.RECENT_RATE_SNAPSHOTS),
+            stalled_for=self.snapshots.time_since_unclaimed_change(),
+            boost=snapshot.boost,
+        ))
+        if claim:
+            logging.info(f"Claiming ({self.policy.name} policy): {reason}")
+            return True
                     
-        logging.info(f"Miner is mining with hashrate: {mining_info['hashrate']}. "
+        logging.info(f"Miner is mining with hashrate: {snapshot.hashrate} "
+                    f"(avg {self.snapshots.average_hashrate():.1f}), "
+                    f"reward rate: {self.snapshots.recent_reward_rate(MiningConfig.RECENT_RATE_SNAPSHOTS):.1f}/h "
+                    f"(session {self.snapshots.reward_rate():.1f}/h). "
                     f"Waiting for {MiningConfig.MINING_CHECK_INTERVAL // 60} minutes. "
-                    f"Time since unclaimed change: {self.time_since_unclaimed_change // 60} minutes")
-        time.sleep(MiningConfig.MINING_CHECK_INTERVAL)
-        return False, mining_info
+                    f"Time since unclaimed change: {int(self.snapshots.time_since_unclaimed_change()) // 60} minutes")
+        return False
 
-    def stop_mining(self, mining_info: Dict[str, Any]) -> Tuple[bool, Dict[str, Any]]:
+    def stop_mining(self, mining_info: Dict[str, Any]) -> Steps:
         """Stop mining, claim rewards, and prepare for next session"""
-        logging.info("Stopping mining session and claiming rewards")
-        
-        # Click claim button
-        stop_and_claim_btn_offset = self.get_button_offset('claim')
-        logging.info("Clicking Stop_And_Claim")
-        utils.click_on_screen(**stop_and_claim_btn_offset)
+        logging.info(f"{self.miner_config['name']}: Stopping mining session and claiming rewards")
         
-        # Process rewards
-        self.process_mining_rewards(mining_info)
+        yield Input("claim", Priority.CLAIM, self.click_claim)
+        yield Call(self.process_mining_rewards, (mining_info,))
+        yield Sleep((yield Call(self.restart_wait_time)))
         
+        # Return to home page
+        yield Input("go_home", Priority.NAVIGATE, self.go_home, kwargs={"double_click": False})
+
+    def restart_wait_time(self) -> float:
+        """Seconds to wait after claiming before the next session can start"""
         # If should_mine is True, we can proceed immediately
         if self.db.should_start_mining(self.miner_config["name"]):
             logging.info("Can start mining immediately")
-            time.sleep(MiningConfig.GENERAL_WAIT_TIME)
-        else:
-            logging.info(f"Completed mining_per_cooldown sessions. "
-                        f"Waiting for {MiningConfig.COOLDOWN_WAIT_TIME // 60} minutes")
-            time.sleep(MiningConfig.COOLDOWN_WAIT_TIME)
-        
-        # Return to home page
-        self.activate_window()
-        logo_btn_offset = self.get_button_offset('logo')
-        logging.info("Clicking Logo to go to home page")
-        utils.click_on_screen(**logo_btn_offset, double_click=False)
-        
-        return True, mining_info
+            return MiningConfig.GENERAL_WAIT_TIME
+        # The claim was just recorded, so the page timer has nothing to add
+        wait = self.cooldown_wait_time(read_screen=False)
+        logging.info(f"Completed mining_per_cooldown sessions. "
+                    f"Waiting for {wait / 60:.1f} minutes")
+        return wait
 
-    def _get_valid_mining_info(self) -> Optional[Dict[str, Any]]:
+    def _get_valid_mining_info(self) -> Steps:
         """Get valid mining info with retry"""
-        mining_info = utils.get_miner_info(self.miner_config)
+        mining_info = yield Call(utils.get_miner_info, (self.miner_config,))
         if 'hashrate' not in mining_info:
-            logging.info("Hashrate not found. Waiting for 10 seconds")
-            time.sleep(10)
-            mining_info = utils.get_miner_info(self.miner_config)
+            logging.info(f"Hashrate not found by any OCR variant. Re-capturing in {MiningConfig.OCR_RECAPTURE_WAIT} seconds")
+            yield Sleep(MiningConfig.OCR_RECAPTURE_WAIT)
+            mining_info = yield Call(utils.get_miner_info, (self.miner_config,))
             if 'hashrate' not in mining_info:
                 logging.info("Hashrate not found. Try again in a bit")
-                time.sleep(10)
                 return None
         return mining_info
 
-def mine_pond(miner_config: Dict[str, Any], skip_cooldown: bool, db_manager: DatabaseManager) -> None:
-    """Main mining loop"""
-    session = MiningSession(miner_config, db_manager)
-    
-    while True:
-        logging.info("Checking miner status")
+    def cycle(self, skip_cooldown: bool) -> Steps:
+        """
+        One pass of the mining loop. mine_pond drives it with run_steps and
+        the asyncio runtime with AsyncMiner.drive, so both share one state
+        machine.
+        """
+        name = self.miner_config["name"]
+        logging.info(f"{name}: Checking miner status")
         try:
-            status = utils.get_miner_status(miner_config)
+            status = yield Call(utils.get_miner_status, (self.miner_config,))
+            FLEET.update(name, state=status or MiningState.UNKNOWN)
+            if self.resuming:
+                yield Call(self.resume, (status,))
             
             if status == MiningState.CLAIMING:
-                if session.handle_claiming(skip_cooldown):
-                    logging.info("Should mine. Starting new miner")
-                    utils.goto_miner_page(miner_config)
-                    session.start_mining()
+                yield from self.handle_claiming(skip_cooldown)
+                logging.info(f"{name}: Should mine. Starting new miner")
+                yield from self.goto_miner_page_steps()
+                yield from self.start_mining_steps()
                     
             elif status == MiningState.MINING:
-                claimed, mining_info = session.handle_mining()
-                if claimed:
-                    logging.info("Mining session ended. Starting a new one.")
-                    utils.goto_miner_page(miner_config)
-                    session.start_mining()
+                if (yield from self.handle_mining()):
+                    logging.info(f"{name}: Mining session ended. Starting a new one.")
+                    yield from self.goto_miner_page_steps()
+                    yield from self.start_mining_steps()
                     
             else:
-                if not utils.is_miner_page(miner_config):
-                    logging.info("We are not in the mining page. Going back to the miner page")
-                    utils.goto_miner_page(miner_config)
+                if not (yield Input("is_miner_page", Priority.CHECK, utils.is_miner_page, (self.miner_config,))):
+                    logging.info(f"{name}: We are not in the mining page. Going back to the miner page")
+                    yield from self.goto_miner_page_steps()
                 
-                session.start_mining()
+                yield from self.start_mining_steps()
                 
         except Exception as e:
-            logging.error(f"Error in mining loop: {e}")
+            FLEET.update(name, last_error=str(e))
+            FLEET.increment(name, "errors")
+            logging.error(f"{name}: Error in mining loop: {e}")
             logging.exception("Stack trace:")
-            time.sleep(MiningConfig.RETRY_WAIT_TIME)
+            yield Sleep(MiningConfig.RETRY_WAIT_TIME)
             
-        time.sleep(MiningConfig.GENERAL_WAIT_TIME)
+        yield Sleep(MiningConfig.GENERAL_WAIT_TIME)
+
+def mine_pond(miner_config: Dict[str, Any], skip_cooldown: bool, db_manager: DatabaseManager) -> None:
+    """Main mining loop"""
+    session = MiningSession(miner_config, db_manager)
+    
+    while True:
+        run_steps(session.cycle(skip_cooldown))
 
 def format_rewards(rewards_in_millions: float) -> str:
     """Format rewards in billions with 3 decimal places"""
@@ -278,13 +446,13 @@ def analyze_mining_sessions(db_manager: DatabaseManager) -> None:
         # Get stats per miner
         cursor = conn.execute("""
             SELECT 
-                miner_name,
+                CASE WHEN source IS NULL THEN miner_name ELSE source || '/' || miner_name END,
                 COUNT(*) as total_sessions,
                 COUNT(CASE WHEN rewards = 0 OR rewards IS NULL THEN 1 END) as bust_sessions,
                 SUM(CASE WHEN rewards IS NULL THEN 0 ELSE rewards END) as total_rewards
             FROM mining_sessions
             WHERE end_time IS NOT NULL
-            GROUP BY miner_name
+            GROUP BY source, miner_name
         """)
         miner_stats = cursor.fetchall()
         
@@ -318,7 +486,8 @@ def analyze_mining_sessions(db_manager: DatabaseManager) -> None:
         
         # Get active sessions
         cursor = conn.execute("""
-            SELECT miner_name, start_time, cooldown_count
+            SELECT CASE WHEN source IS NULL THEN miner_name ELSE source || '/' || miner_name END,
+                   start_time, cooldown_count
             FROM mining_sessions
             WHERE end_time IS NULL
             ORDER BY start_time DESC
@@ -334,14 +503,61 @@ def analyze_mining_sessions(db_manager: DatabaseManager) -> None:
                 start_time = datetime.fromisoformat(start_time)
                 print(f"{miner_name:<20} {start_time.strftime('%Y-%m-%d %H:%M:%S'):<25} {cooldown_count:<15}")
 
+def backtest_policies(db_manager: DatabaseManager, miner_name: Optional[str], mining_per_cooldown: int) -> None:
+    """Compare claim policies against the finished sessions in the database"""
+    history = SessionHistory.from_db(db_manager, miner_name, MiningConfig.MIN_REWARD_THRESHOLD)
+    if not len(history):
+        print("No finished sessions to backtest")
+        return
+
+    overhead = cycle_overhead(mining_per_cooldown)
+    policies = [
+        RulePolicy(MiningConfig.STALL_CHECK_TIME),
+        YieldPolicy(history, overhead, MiningConfig.MIN_REWARD_THRESHOLD, MiningConfig.STALL_CHECK_TIME),
+    ] + [FixedDurationPolicy(hours * 3600, MiningConfig.STALL_CHECK_TIME) for hours in (1, 2, 4)]
+
+    print(f"\n=== Policy Backtest ({len(history)} sessions{', ' + miner_name if miner_name else ''}) ===\n")
+    print("-" * 80)
+    print(f"{'Policy':<20} {'Rewards':<15} {'Hours':<15} {'Rewards/Hour':<15} {'Bust Rate':<15}")
+    print("-" * 80)
+    for policy in policies:
+        result = backtest(policy, history, overhead, MiningConfig.MINING_CHECK_INTERVAL,
+                          MiningConfig.MIN_REWARD_THRESHOLD)
+        print(f"{policy.name:<20} {format_rewards(result['rewards']):<15} {result['hours']:<15.1f} "
+              f"{format_rewards(result['rewards_per_hour']):<15} {result['bust_rate'] * 100:<.1f}%")
+    print("\nOnly session start and end are stored, so the yield policy is replayed on its historical")
+    print("reward curve alone; the live reward rate it uses while mining is not backtested.")
+
 def main():
     parser = argparse.ArgumentParser(description="Manage POND mining operations")
-    parser.add_argument("function", type=str, help="Function to run (start_miner/mine_pond/stats)")
-    parser.add_argument("miner_number", type=int, nargs='?', help="Miner number to check status for")
+    parser.add_argument("function", type=str, help="Function to run (start_miner/mine_pond/mine_fleet/stats/backtest/top)")
+    parser.add_argument("miner_numbers", type=int, nargs='*', help="Miner number(s) to run, mine_fleet defaults to all")
     parser.add_argument("--skip-cooldown", action="store_true", help="Skip waiting for the cooldown")
     parser.add_argument("--db-path", type=str, default="mining_sessions.db", help="Path to the database file")
+    parser.add_argument("--db", type=str, nargs='+', help="Session databases or directories of them to merge for stats")
+    parser.add_argument("--aggregate-db", type=str, default="fleet_sessions.db", help="Path to the merged fleet database")
+    parser.add_argument("--miner", type=str, help="Only backtest sessions of this miner")
+    parser.add_argument("--mining-per-cooldown", type=int, default=1, help="Sessions per cooldown assumed by backtest")
+    parser.add_argument("--feed", type=str, default=DEFAULT_FEED_PATH, help="Status feed written by miners and read by top")
+    parser.add_argument("--status-port", type=int, help="Serve miner status as JSON on this local port")
     args = parser.parse_args()
 
+    if args.function == "top":
+        from dashboard import run_dashboard
+        run_dashboard(args.feed)
+        return
+
+    if args.function == "stats" and args.db:
+        # Merge every host's database into the aggregate store, then report on it
+        db_manager = DatabaseManager(args.aggregate_db)
+        db_manager.init_db()
+        for db_path in find_databases(args.db):
+            if os.path.abspath(db_path) == os.path.abspath(args.aggregate_db):
+                continue
+            db_manager.merge_from(db_path)
+        analyze_mining_sessions(db_manager)
+        return
+
     # Initialize database manager
     db_manager = DatabaseManager(args.db_path)
     db_manager.init_db()
@@ -350,8 +566,22 @@ def main():
         analyze_mining_sessions(db_manager)
         return
 
+    if args.function == "backtest":
+        backtest_policies(db_manager, args.miner, args.mining_per_cooldown)
+        return
+
     config = utils.load_config_from_json()
-    miner_config = config["miners"][args.miner_number]
+    FLEET.enable_feed(args.feed)
+    if args.status_port:
+        serve_status(FLEET, args.status_port)
+
+    if args.function == "mine_fleet":
+        from runtime import run_fleet
+        miner_numbers = args.miner_numbers or range(len(config["miners"]))
+        run_fleet([config["miners"][number] for number in miner_numbers], args.skip_cooldown, db_manager)
+        return
+
+    miner_config = config["miners"][args.miner_numbers[0]]
 
     if args.function == "start_miner":
         session = MiningSession(miner_config, db_manager)
@@ -1,9 +1,8 @@
 import argparse
 import logging
 import pywinctl as pwc
-from pymacwindow import MacWindowTracker
+from pymacwindow import MacWindow, WindowTracker
 import curses
-import time
 import json
 from utils import load_config_from_json
 import pyautogui
@@ -17,9 +16,8 @@ def on_click(x, y, button, pressed):
     if not pressed:
         return False  # Stop the listener
 
-def calculate_miner_config(config):
+def calculate_miner_config(config, tracker: WindowTracker):
     miner_config = config.copy()
-    tracker = MacWindowTracker()
     print(f"Please click on the miner window to select it")
     # Wait for mouse click
     with mouse.Listener(on_click=on_click) as listener:
@@ -28,23 +26,23 @@ def calculate_miner_config(config):
     click_position = pyautogui.position()
     print("Clicked at ", click_position)
     
-    time.sleep(1)
+    # The watcher reports the focus change on its own, wait for it instead of looking it up
+    tracker.wait_for_change(timeout=1)
     miner_window = tracker.get_active_window()
-    box = miner_window.box
 
     print(f"Active window: {miner_window}")
-    print(f"Box dimensions: {box}")
     
     if miner_window is None or miner_window.box is None or (miner_window.box.left == 0 and miner_window.box.top == 0):
         print("Failed to get a valid window after multiple attempts.")
-        print(f"Box dimensions: {miner_window.box}")
         print("Please try again.")
         print(f"Active window: {miner_window}")
         return
+    box = miner_window.box
     
     print(f"Title: {miner_window.title}")
     print(f"Box dimensions: {box}")
     offset = (box.width - MINER_BOX_SIZE) // 2
+    miner_config["window_title"] = miner_window.title
     miner_config["window_box"] = {
         "left": box.left,
         "top": box.top,
@@ -62,14 +60,57 @@ def calculate_miner_config(config):
     print(json.dumps(miner_config, indent=4))
     return miner_window
 
+def window_drift(miner_config, window: MacWindow):
+    """How far a calibrated miner window has moved or been resized, or None if it hasn't"""
+    calibrated = miner_config.get("window_box")
+    if not calibrated:
+        return None
+    box = window.box
+    drift = {
+        "left": box.left - calibrated["left"],
+        "top": box.top - calibrated["top"],
+        "width": box.width - calibrated["width"],
+        "height": box.height - calibrated["height"],
+    }
+    return drift if any(drift.values()) else None
+
+def watch_drift(config, tracker: WindowTracker):
+    """Report calibrated miner windows as they move, from the tracker's change events"""
+    miners = {miner["window_title"]: miner for miner in config["miners"] if "window_title" in miner}
+    if not miners:
+        print("No calibrated miners with a window_title, run calibration first")
+        return
+
+    def on_change(window: MacWindow):
+        miner = miners.get(window.title)
+        if miner is None:
+            return
+        drift = window_drift(miner, window)
+        if drift:
+            print(f"{miner['name']} drifted by {drift}, recalibrate it")
+
+    tracker.subscribe(on_change)
+    for title in miners:
+        window = tracker.get_window(title)
+        if window:
+            on_change(window)
+    print("Watching miner windows for drift, Ctrl+C to stop")
+    while True:
+        tracker.wait_for_change()
+
 if __name__ == "__main__":
     parser = argparse.ArgumentParser(description="Get miner status")
     parser.add_argument("miner_number", type=int, nargs='?', help="Miner number to check status for")
+    parser.add_argument("--check-drift", action="store_true", help="Watch calibrated miner windows for drift")
     args = parser.parse_args()
 
     config = load_config_from_json()
-    miner_number = args.miner_number
-    if miner_number is None:
-        miner_number = 0
-    miner_config = config["miners"][miner_number]
-    calculate_miner_config(miner_config)
+    with WindowTracker() as tracker:
+        if args.check_drift:
+            watch_drift(config, tracker)
+        else:
+            miner_number = args.miner_number
+            if miner_number is None:
+                miner_number = 0
+            miner_config = config["miners"][miner_number]
+            calculate_miner_config(miner_config, tracker)
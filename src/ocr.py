@@ -0,0 +1,152 @@
+import re
+from collections import Counter, defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Dict, Any, Callable, List, Optional, Tuple
+
+import pytesseract
+from PIL import Image, ImageEnhance, ImageOps
+
+from config import logging
+
+
+def parse_time_to_seconds(time_str):
+    time_parts = time_str.split(':')
+    if len(time_parts) == 1:
+        return int(time_parts[0])  # seconds
+    elif len(time_parts) == 2:
+        return int(time_parts[0]) * 60 + int(time_parts[1])  # minutes:seconds
+    elif len(time_parts) == 3:
+        return int(time_parts[0]) * 3600 + int(time_parts[1]) * 60 + int(time_parts[2])  # hours:minutes:seconds
+    else:
+        logging.warning(f"Unexpected time format: {time_str}")
+        return 0
+
+
+def enhance(img: Image.Image) -> Image.Image:
+    img = ImageEnhance.Contrast(img.convert('L')).enhance(2)
+    img = ImageEnhance.Brightness(img).enhance(1.2)
+    return ImageEnhance.Sharpness(img).enhance(2)
+
+
+def binarize(img: Image.Image) -> Image.Image:
+    return img.convert('L').point(lambda value: 255 if value > 128 else 0)
+
+
+def upscale(img: Image.Image) -> Image.Image:
+    return enhance(img.resize((img.width * 2, img.height * 2), Image.LANCZOS))
+
+
+def invert(img: Image.Image) -> Image.Image:
+    return ImageOps.invert(enhance(img))
+
+
+@dataclass
+class OcrVariant:
+    name: str
+    preprocess: Callable[[Image.Image], Image.Image]
+    config: str
+
+
+VARIANTS = [
+    OcrVariant("raw_psm6", lambda img: img, "--psm 6"),
+    OcrVariant("enhanced_psm6", enhance, "--psm 6"),
+    OcrVariant("enhanced_psm4", enhance, "--psm 4"),
+    OcrVariant("binarized_psm6", binarize, "--psm 6"),
+    OcrVariant("upscaled_psm6", upscale, "--psm 6"),
+    OcrVariant("inverted_psm6", invert, "--psm 6"),
+]
+
+# Each field is converted and validated; a reading that fails either is discarded
+FIELD_PARSERS: Dict[str, Callable[[str], Any]] = {
+    "status": lambda value: re.fullmatch(r"[A-Z]+", value.replace(".", "").upper()).group(0),
+    "unclaimed": lambda value: value if float(re.sub(r'[^\d.]', '', value)) >= 0 else None,
+    "boost": float,
+    "time": lambda value: parse_time_to_seconds(re.fullmatch(r"\d{1,3}(:\d{2}){0,2}", value).group(0)),
+    "hashrate": lambda value: float(re.fullmatch(r"[\d@.]+", value.split()[0]).group(0).replace('@', '0')),
+}
+
+VARIANT_WINS: Counter = Counter()
+
+_executor = ThreadPoolExecutor(max_workers=len(VARIANTS), thread_name_prefix="ocr")
+
+
+def read_fields(img: Image.Image, variant: OcrVariant) -> Dict[str, Tuple[Any, float]]:
+    """Run one variant and return {field: (value, confidence)} for fields that validate"""
+    data = pytesseract.image_to_data(variant.preprocess(img), config=variant.config,
+                                     output_type=pytesseract.Output.DICT)
+    lines: Dict[Tuple[int, int, int], List[Tuple[str, float]]] = defaultdict(list)
+    for i, word in enumerate(data["text"]):
+        confidence = float(data["conf"][i])
+        if word.strip() and confidence >= 0:
+            lines[(data["block_num"][i], data["par_num"][i], data["line_num"][i])].append((word, confidence))
+
+    fields = {}
+    for words in lines.values():
+        text = " ".join(word for word, _ in words)
+        if ':' not in text:
+            continue
+        key, value = text.split(':', 1)
+        key = key.strip().lower()
+        if key not in FIELD_PARSERS or key in fields:
+            continue
+        try:
+            parsed = FIELD_PARSERS[key](value.strip())
+        except (AttributeError, ValueError, IndexError, TypeError):
+            continue
+        if parsed is None:
+            continue
+        # A line's confidence is only as good as its weakest word
+        fields[key] = (parsed, min(confidence for _, confidence in words))
+    return fields
+
+
+def vote(readings: Dict[str, Dict[str, Tuple[Any, float]]]) -> Tuple[Dict[str, Any], Optional[str]]:
+    """
+    Pick each field's value by summing confidences of the variants that
+    agree on it. Returns the info and the variant that agreed with the most
+    chosen values, highest total confidence breaking ties.
+    """
+    info = {}
+    scores: Dict[str, Dict[Any, float]] = defaultdict(lambda: defaultdict(float))
+    for fields in readings.values():
+        for key, (value, confidence) in fields.items():
+            scores[key][value] += confidence
+    for key, candidates in scores.items():
+        info[key] = max(candidates.items(), key=lambda item: item[1])[0]
+
+    best_variant, best_score = None, (0, 0.0)
+    for name, fields in readings.items():
+        agreed = [confidence for key, (value, confidence) in fields.items() if info.get(key) == value]
+        score = (len(agreed), sum(agreed))
+        if score > best_score:
+            best_variant, best_score = name, score
+    return info, best_variant
+
+
+def read_mining_info(img: Image.Image) -> Dict[str, Any]:
+    """Read the miner panel with every variant in parallel and vote on the result"""
+    futures = {variant.name: _executor.submit(read_fields, img, variant) for variant in VARIANTS}
+    readings = {}
+    for name, future in futures.items():
+        try:
+            readings[name] = future.result()
+        except Exception as e:
+            logging.warning(f"OCR variant {name} failed: {e}")
+
+    info, winner = vote(readings)
+    if winner:
+        VARIANT_WINS[winner] += 1
+        if sum(VARIANT_WINS.values()) % 50 == 0:
+            logging.info(f"OCR variant wins: {variant_stats()}")
+    info.setdefault('time', 0)
+    logging.debug(f"OCR readings: {readings}")
+    logging.info(f"Mining info: {info} (best variant: {winner})")
+    return info
+
+
+def variant_stats() -> str:
+    total = sum(VARIANT_WINS.values())
+    if not total:
+        return "no OCR reads yet"
+    return ", ".join(f"{name}: {wins} ({wins / total * 100:.0f}%)" for name, wins in VARIANT_WINS.most_common())
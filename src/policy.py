@@ -0,0 +1,222 @@
+import abc
+import bisect
+from dataclasses import dataclass
+from typing import Dict, Any, List, Optional, Tuple
+
+from config import logging
+from db_utils import DatabaseManager
+
+
+@dataclass
+class PolicyContext:
+    """What a claim policy sees about the running session"""
+    elapsed: float  # Seconds mined this session, as shown on the page
+    unclaimed: float
+    hashrate: float
+    reward_rate: float  # Recent unclaimed gained per hour
+    stalled_for: float  # Seconds since unclaimed last changed
+    boost: float = 0.0
+
+
+class SessionHistory:
+    """Finished sessions from the database, used to estimate reward curves"""
+
+    def __init__(self, sessions: List[Tuple[float, float, float]], threshold: float = 100.0):
+        # (time_mined, rewards, boost), ordered by time mined
+        self.sessions = sorted(sessions)
+        self.threshold = threshold
+
+    @classmethod
+    def from_db(cls, db_manager: DatabaseManager, miner_name: Optional[str] = None,
+                threshold: float = 100.0) -> "SessionHistory":
+        query = """
+            SELECT time_mined, COALESCE(rewards, 0), COALESCE(boost, 0)
+            FROM mining_sessions
+            WHERE end_time IS NOT NULL AND time_mined > 0
+        """
+        params: Tuple = ()
+        if miner_name:
+            query += " AND miner_name = ?"
+            params = (miner_name,)
+        with db_manager.get_connection() as conn:
+            return cls([tuple(row) for row in conn.execute(query, params)], threshold)
+
+    def __len__(self) -> int:
+        return len(self.sessions)
+
+    def without(self, index: int) -> "SessionHistory":
+        """The history minus one session, for leave-one-out evaluation"""
+        return SessionHistory(self.sessions[:index] + self.sessions[index + 1:], self.threshold)
+
+    @property
+    def bust_rate(self) -> float:
+        if not self.sessions:
+            return 0.0
+        return sum(1 for _, rewards, _ in self.sessions if rewards < self.threshold) / len(self.sessions)
+
+    def reward_per_hour(self, overhead: float) -> float:
+        """Average yield of a whole cycle: mining time plus restart and cooldown overhead"""
+        if not self.sessions:
+            return 0.0
+        total_rewards = sum(rewards for _, rewards, _ in self.sessions)
+        total_time = sum(time_mined + overhead for time_mined, _, _ in self.sessions)
+        return total_rewards / total_time * 3600
+
+    def marginal_rate(self, elapsed: float, window: float = 1800) -> Optional[float]:
+        """
+        Reward per hour of mining a little longer, from the mean reward of
+        sessions that ended around elapsed versus around elapsed + window.
+        None when there is not enough history around that point.
+        """
+        times = [time_mined for time_mined, _, _ in self.sessions]
+
+        def mean_reward_near(t: float) -> Optional[float]:
+            lo = bisect.bisect_left(times, t - window / 2)
+            hi = bisect.bisect_right(times, t + window / 2)
+            if hi - lo < 3:
+                return None
+            return sum(rewards for _, rewards, _ in self.sessions[lo:hi]) / (hi - lo)
+
+        now, later = mean_reward_near(elapsed), mean_reward_near(elapsed + window)
+        if now is None or later is None:
+            return None
+        return (later - now) / window * 3600
+
+
+class ClaimPolicy(abc.ABC):
+    """Decides whether a running session should be stopped and claimed"""
+    name = "base"
+
+    @abc.abstractmethod
+    def should_claim(self, ctx: PolicyContext) -> Tuple[bool, str]:
+        pass
+
+    def fit(self, history: SessionHistory) -> "ClaimPolicy":
+        """The same policy estimated from history; policies that learn nothing return themselves"""
+        return self
+
+
+class RulePolicy(ClaimPolicy):
+    """The original fixed rules: claim when hashrate drops to zero or rewards stall"""
+    name = "rules"
+
+    def __init__(self, stall_time: float = 1200):
+        self.stall_time = stall_time
+
+    def should_claim(self, ctx: PolicyContext) -> Tuple[bool, str]:
+        if ctx.hashrate == 0:
+            return True, "hashrate is zero"
+        if ctx.unclaimed > 0 and ctx.stalled_for >= self.stall_time:
+            return True, f"no increase in unclaimed rewards for {self.stall_time // 60:.0f} minutes"
+        return False, "mining"
+
+
+class FixedDurationPolicy(RulePolicy):
+    """Rules, plus claim once the session has mined for a fixed duration"""
+
+    def __init__(self, duration: float, stall_time: float = 1200):
+        super().__init__(stall_time)
+        self.duration = duration
+        self.name = f"fixed_{duration / 3600:g}h"
+
+    def should_claim(self, ctx: PolicyContext) -> Tuple[bool, str]:
+        claim, reason = super().should_claim(ctx)
+        if claim:
+            return claim, reason
+        if ctx.elapsed >= self.duration:
+            return True, f"mined for {self.duration / 3600:g} hours"
+        return False, "mining"
+
+
+class YieldPolicy(RulePolicy):
+    """
+    Claims when carrying on earns less per hour than claiming and starting
+    over would, on average, once restart and cooldown overhead are paid.
+    The marginal rate comes from live telemetry when the miner has it and
+    falls back to the historical reward curve.
+    """
+    name = "yield"
+
+    def __init__(self, history: SessionHistory, overhead: float, threshold: float = 100.0,
+                 stall_time: float = 1200, min_elapsed: float = 1800):
+        super().__init__(stall_time)
+        self.history = history
+        self.overhead = overhead
+        self.threshold = threshold
+        self.min_elapsed = min_elapsed
+        self.restart_rate = history.reward_per_hour(overhead)
+
+    def fit(self, history: SessionHistory) -> "YieldPolicy":
+        return YieldPolicy(history, self.overhead, self.threshold, self.stall_time, self.min_elapsed)
+
+    def should_claim(self, ctx: PolicyContext) -> Tuple[bool, str]:
+        claim, reason = super().should_claim(ctx)
+        if claim:
+            return claim, reason
+        # Claiming below the threshold is a guaranteed bust
+        if ctx.elapsed < self.min_elapsed or ctx.unclaimed < self.threshold or not self.restart_rate:
+            return False, "mining"
+        marginal = ctx.reward_rate if ctx.reward_rate > 0 else self.history.marginal_rate(ctx.elapsed)
+        if marginal is not None and marginal < self.restart_rate:
+            return True, f"earning {marginal:.1f}/h, restarting averages {self.restart_rate:.1f}/h"
+        return False, "mining"
+
+
+def build_policy(name: str, db_manager: DatabaseManager, miner_config: Dict[str, Any],
+                 overhead: float, threshold: float, stall_time: float) -> ClaimPolicy:
+    """Policy named in config: "rules" (default), "yield" or "fixed_<hours>h"."""
+    if name == "yield":
+        history = SessionHistory.from_db(db_manager, miner_config.get("name"), threshold)
+        if not len(history):
+            logging.warning("No session history for the yield policy yet, using the fixed rules")
+            return RulePolicy(stall_time)
+        return YieldPolicy(history, overhead, threshold, stall_time)
+    if name.startswith("fixed_") and name.endswith("h"):
+        return FixedDurationPolicy(float(name[len("fixed_"):-1]) * 3600, stall_time)
+    if name != "rules":
+        raise ValueError(f"Unknown claim policy: {name}")
+    return RulePolicy(stall_time)
+
+
+def backtest(policy: ClaimPolicy, history: SessionHistory, overhead: float,
+             check_interval: float = 300, threshold: float = 100.0) -> Dict[str, float]:
+    """
+    Replay finished sessions against a policy.
+    Only start and end are stored per session, so each is replayed as a
+    straight-line climb to its final reward, checked every check_interval,
+    with hashrate dropping to zero at the recorded end. A claim below the
+    threshold counts as a bust, as it does when mining.
+
+    The policy only sees what it would have seen at each check: no live
+    reward rate (the session's average is hindsight), and a history fitted
+    without the session being replayed. Policies that act on the live rate
+    are therefore only tested on their historical fallback.
+    """
+    total_rewards = 0.0
+    total_time = 0.0
+    busts = 0
+    for index, (time_mined, rewards, boost) in enumerate(history.sessions):
+        fitted = policy.fit(history.without(index))
+        rate = rewards / time_mined * 3600
+        claimed_at, claimed = time_mined, rewards
+        elapsed = check_interval
+        while elapsed < time_mined:
+            ctx = PolicyContext(elapsed=elapsed, unclaimed=rate * elapsed / 3600, hashrate=1.0,
+                                reward_rate=0.0, stalled_for=0.0, boost=boost)
+            if fitted.should_claim(ctx)[0]:
+                claimed_at, claimed = elapsed, ctx.unclaimed
+                break
+            elapsed += check_interval
+        if claimed < threshold:
+            busts += 1
+            claimed = 0.0
+        total_rewards += claimed
+        total_time += claimed_at + overhead
+    sessions = len(history.sessions)
+    return {
+        "sessions": sessions,
+        "rewards": total_rewards,
+        "hours": total_time / 3600,
+        "rewards_per_hour": total_rewards / total_time * 3600 if total_time else 0.0,
+        "bust_rate": busts / sessions if sessions else 0.0,
+    }
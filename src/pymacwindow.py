@@ -1,7 +1,12 @@
+import logging
 import subprocess
-import pywinctl
-import time
-from typing import Optional
+import threading
+from abc import ABC, abstractmethod
+from collections import namedtuple
+from typing import Callable, Dict, List, Optional, Tuple
+
+# Same shape as pywinctl's Box, so calibration can use either kind of window
+Box = namedtuple("Box", ["left", "top", "width", "height"])
 
 class MacWindow:
     """
@@ -58,13 +63,268 @@ class MacWindow:
     def getPID(self) -> Optional[int]:
         return self._pid
         
-    def box(self) -> tuple:
-        """Returns the window box as (left, top, width, height)"""
-        return (self._left, self._top, self._width, self._height)
+    @property
+    def box(self) -> Box:
+        """The window box as (left, top, width, height)"""
+        return Box(self._left, self._top, self._width, self._height)
 
     def __str__(self) -> str:
         return f"<{self.__class__.__name__} '{self.title}' of '{self.appName}'>"
 
+class WindowProvider(ABC):
+    """
+    Source of active window change notifications.
+    Providers call on_change with a MacWindow whenever the frontmost window
+    changes title, owner or geometry.
+    """
+
+    @abstractmethod
+    def start(self, on_change: Callable[[MacWindow], None]) -> None:
+        ...
+
+    def stop(self) -> None:
+        pass
+
+    @abstractmethod
+    def snapshot(self) -> Optional[MacWindow]:
+        """One-shot lookup of the current active window, used after invalidation"""
+
+
+class AppleScriptWindowProvider(WindowProvider):
+    """
+    Keeps a single long-lived osascript process that watches the frontmost
+    window and only reports when it changes, instead of spawning a new
+    process for every poll.
+    """
+
+    WATCH_SCRIPT = '''
+        on run argv
+            set pollDelay to (item 1 of argv) as real
+            set lastLine to ""
+            repeat
+                set currentLine to my frontWindowLine()
+                if currentLine is not lastLine then
+                    log currentLine
+                    set lastLine to currentLine
+                end if
+                delay pollDelay
+            end repeat
+        end run
+
+        on frontWindowLine()
+            tell application "System Events"
+                set frontApp to name of first application process whose frontmost is true
+                try
+                    tell process frontApp
+                        set frontWindow to first window
+                        set windowTitle to name of frontWindow
+                        set {windowLeft, windowTop} to position of frontWindow
+                        set {windowWidth, windowHeight} to size of frontWindow
+                    end tell
+                on error
+                    return frontApp & tab & "" & tab & "0" & tab & "0" & tab & "0" & tab & "0"
+                end try
+            end tell
+            return frontApp & tab & windowTitle & tab & windowLeft & tab & windowTop & tab & windowWidth & tab & windowHeight
+        end frontWindowLine
+    '''
+
+    def __init__(self, interval: float = 0.25):
+        self.interval = interval
+        self._process: Optional[subprocess.Popen] = None
+        self._reader: Optional[threading.Thread] = None
+
+    def start(self, on_change: Callable[[MacWindow], None]) -> None:
+        if self._process is not None:
+            return
+        # osascript writes `log` output to stderr, one line per change
+        self._process = subprocess.Popen(
+            ['osascript', '-e', self.WATCH_SCRIPT, str(self.interval)],
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.PIPE,
+            text=True,
+            bufsize=1,
+        )
+        self._reader = threading.Thread(target=self._read_changes, args=(on_change,), daemon=True)
+        self._reader.start()
+
+    def _read_changes(self, on_change: Callable[[MacWindow], None]) -> None:
+        for line in self._process.stderr:
+            window = parse_window_line(line, sep='\t')
+            if window:
+                on_change(window)
+        logging.warning("Window watcher process exited")
+
+    def stop(self) -> None:
+        if self._process is not None:
+            self._process.terminate()
+            self._process.wait()
+            self._process = None
+
+    def snapshot(self) -> Optional[MacWindow]:
+        return MacWindowTracker.get_active_window_applescript()
+
+
+class FakeWindowProvider(WindowProvider):
+    """
+    In-memory provider for driving a WindowTracker without a window server,
+    e.g. on Linux or in tests.
+    """
+
+    def __init__(self, window: Optional[MacWindow] = None):
+        self._window = window
+        self._on_change: Optional[Callable[[MacWindow], None]] = None
+
+    def start(self, on_change: Callable[[MacWindow], None]) -> None:
+        self._on_change = on_change
+        if self._window:
+            on_change(self._window)
+
+    def stop(self) -> None:
+        self._on_change = None
+
+    def snapshot(self) -> Optional[MacWindow]:
+        return self._window
+
+    def set_active_window(self, window: MacWindow) -> None:
+        """Simulate the user focusing, moving or resizing a window"""
+        self._window = window
+        if self._on_change:
+            self._on_change(window)
+
+
+class WindowTracker:
+    """
+    Event-driven window tracking service.
+    Geometry reported by the provider is cached in memory, so lookups made
+    during calibration and drift checks never touch the window server.
+    Call invalidate() to force a fresh lookup on the next read.
+    """
+
+    def __init__(self, provider: Optional[WindowProvider] = None):
+        self._provider = provider or AppleScriptWindowProvider()
+        self._cond = threading.Condition()
+        self._active: Optional[MacWindow] = None
+        self._windows: Dict[Tuple[str, str], MacWindow] = {}
+        self._version = 0
+        self._callbacks: List[Callable[[MacWindow], None]] = []
+        self._started = False
+
+    def start(self) -> "WindowTracker":
+        if not self._started:
+            self._started = True
+            self._provider.start(self._on_change)
+        return self
+
+    def stop(self) -> None:
+        if self._started:
+            self._provider.stop()
+            self._started = False
+
+    def __enter__(self) -> "WindowTracker":
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
+
+    def subscribe(self, callback_fn: Callable[[MacWindow], None]) -> None:
+        """Register a callback invoked (on the provider thread) for every change"""
+        self._callbacks.append(callback_fn)
+
+    def _on_change(self, window: MacWindow) -> None:
+        with self._cond:
+            self._active = window
+            self._windows[(window.appName, window.title)] = window
+            self._version += 1
+            self._cond.notify_all()
+        for callback_fn in self._callbacks:
+            try:
+                callback_fn(window)
+            except Exception:
+                logging.exception("Window change callback failed")
+
+    def get_active_window(self) -> Optional[MacWindow]:
+        """Return the cached active window, refreshing it once if invalidated"""
+        with self._cond:
+            if self._active is not None:
+                return self._active
+        window = self._provider.snapshot()
+        if window:
+            with self._cond:
+                self._active = window
+                self._windows[(window.appName, window.title)] = window
+        return window
+
+    def get_window(self, title: str, app_name: Optional[str] = None) -> Optional[MacWindow]:
+        """Return the last known geometry of a window by title from the cache"""
+        with self._cond:
+            for (cached_app, cached_title), window in self._windows.items():
+                if cached_title == title and (app_name is None or cached_app == app_name):
+                    return window
+        return None
+
+    def invalidate(self, title: Optional[str] = None) -> None:
+        """Drop cached geometry for one window title, or everything if no title is given"""
+        with self._cond:
+            if title is None:
+                self._windows.clear()
+                self._active = None
+                return
+            self._windows = {key: window for key, window in self._windows.items() if key[1] != title}
+            if self._active is not None and self._active.title == title:
+                self._active = None
+
+    @property
+    def version(self) -> int:
+        """Number of changes reported so far"""
+        with self._cond:
+            return self._version
+
+    def wait_for_version(self, since: int, timeout: Optional[float] = None) -> Tuple[int, Optional[MacWindow]]:
+        """
+        Block until a change newer than version `since` has been reported and
+        return the current version with the active window. Returns at once if
+        changes arrived after `since` was read, so callers that carry the
+        version between calls miss nothing.
+        """
+        with self._cond:
+            self._cond.wait_for(lambda: self._version != since, timeout=timeout)
+            return self._version, self._active
+
+    def wait_for_change(self, timeout: Optional[float] = None) -> Optional[MacWindow]:
+        """Block until the provider reports a change. Returns None on timeout"""
+        since = self.version
+        version, window = self.wait_for_version(since, timeout)
+        return window if version != since else None
+
+
+def parse_window_line(line: str, sep: str = ', ') -> Optional[MacWindow]:
+    """
+    Parse an AppleScript result of the form app, title, left, top, x2, y2
+    (bounds, sep=', ') or app, title, left, top, width, height (sep=tab).
+    """
+    values = line.strip('\n').split(sep)
+    if len(values) < 6:
+        return None
+    app_name = values[0].strip()
+    window_title = sep.join(values[1:-4]).strip()
+    try:
+        left, top, third, fourth = map(int, values[-4:])
+    except ValueError:
+        return None
+    if sep == '\t':
+        width, height = third, fourth
+    else:
+        width, height = third - left, fourth - top
+    bounds = {
+        'left': left,
+        'top': top,
+        'width': width,
+        'height': height
+    }
+    return MacWindow(window_title, app_name, bounds)
+
+
 class MacWindowTracker:
     """
     A more reliable way to track active windows on macOS using both pywinctl
@@ -98,26 +358,7 @@ class MacWindowTracker:
                                  capture_output=True, 
                                  text=True)
             if result.returncode == 0:
-                values = result.stdout.strip().split(', ')
-                if len(values) >= 6:
-                    app_name = values[0].strip()
-                    window_title = values[1].strip()
-                    try:
-                        # Convert bounds values to integers
-                        left, top, right, bottom = map(int, values[2:6])
-                        width = right - left
-                        height = bottom - top
-                        
-                        bounds = {
-                            'left': left,
-                            'top': top,
-                            'width': width,
-                            'height': height
-                        }
-                        
-                        return MacWindow(window_title, app_name, bounds)
-                    except (ValueError, IndexError):
-                        pass
+                return parse_window_line(result.stdout.strip())
             return None
         except Exception as e:
             print(f"AppleScript error: {e}")
@@ -129,8 +370,10 @@ class MacWindowTracker:
         Get active window using multiple methods for reliability.
         Returns a MacWindow object or None if failed.
         """
-        # Try pywinctl first
+        # Try pywinctl first. Imported here because it needs a window server
+        # on import, and the tracker must also run against a fake provider
         try:
+            import pywinctl
             win = pywinctl.getActiveWindow()
             if win and win.title:
                 return win
@@ -141,28 +384,33 @@ class MacWindowTracker:
         return MacWindowTracker.get_active_window_applescript()
 
     @staticmethod
-    def monitor_active_window(callback_fn, interval: float = 1.0) -> None:
+    def monitor_active_window(callback_fn, interval: float = 1.0,
+                              provider: Optional[WindowProvider] = None) -> None:
         """
         Continuously monitor active window and call callback_fn when it changes.
+        Changes are pushed by a single long-lived watcher instead of spawning
+        a lookup per poll.
         
         Args:
             callback_fn: Function that takes MacWindow object as parameter
-            interval: Polling interval in seconds
+            interval: How often the watcher process samples the front window
+            provider: Optional WindowProvider, defaults to the AppleScript watcher
         """
         last_window = None
-        
-        while True:
-            current_window = MacWindowTracker.get_active_window()
-            print(current_window)
-            print(last_window)
-            if current_window and (not last_window or 
-                current_window.title != last_window.title or
-                current_window.getPID() != last_window.getPID()):
-                
-                callback_fn(current_window)
-                last_window = current_window
-                
-            time.sleep(interval)
+
+        with WindowTracker(provider or AppleScriptWindowProvider(interval)) as tracker:
+            # Read the version before the window so nothing reported in
+            # between, or while callback_fn runs, is skipped
+            version = tracker.version
+            current_window = tracker.get_active_window()
+            while True:
+                if current_window and (not last_window or 
+                    current_window.title != last_window.title or
+                    current_window.getPID() != last_window.getPID()):
+                    
+                    callback_fn(current_window)
+                    last_window = current_window
+                version, current_window = tracker.wait_for_version(version)
 
 def basic_usage():
     # Basic usage
@@ -0,0 +1,119 @@
+import asyncio
+import functools
+import signal
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, List, Optional
+
+from arbiter import InputArbiter
+from config import logging
+from ocr import variant_stats
+from db_utils import DatabaseManager
+from minepond import MiningSession
+from steps import Sleep, Input, Steps
+
+
+class AsyncMiner:
+    """
+    One miner's lifecycle as a coroutine.
+    Capture, OCR and database calls run on the shared executor, input macros
+    are queued on the arbiter of the miner's display lane, and every wait is
+    an asyncio sleep so shutdown interrupts it immediately.
+    """
+
+    def __init__(self, session: MiningSession, skip_cooldown: bool,
+                 arbiter: InputArbiter, executor: ThreadPoolExecutor):
+        self.session = session
+        self.miner_config = session.miner_config
+        self.skip_cooldown = skip_cooldown
+        self.arbiter = arbiter
+        self.executor = executor
+
+    @property
+    def name(self) -> str:
+        return self.miner_config["name"]
+
+    async def run_blocking(self, fn, *args, **kwargs):
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.executor, functools.partial(fn, *args, **kwargs))
+
+    async def submit_input(self, name: str, priority: int, fn, *args, **kwargs):
+        return await self.arbiter.submit(name, self.name, fn, *args, priority=priority, **kwargs)
+
+    async def drive(self, steps: Steps) -> Any:
+        """
+        Drive MiningSession steps: sleeps are cancellable awaits, input
+        macros go through the lane's arbiter and blocking calls run on the
+        executor.
+        """
+        result, error = None, None
+        while True:
+            try:
+                effect = steps.throw(error) if error else steps.send(result)
+            except StopIteration as stop:
+                return stop.value
+            result, error = None, None
+            try:
+                if isinstance(effect, Sleep):
+                    await asyncio.sleep(effect.seconds)
+                elif isinstance(effect, Input):
+                    result = await self.submit_input(effect.name, effect.priority, effect.fn,
+                                                     *effect.args, **effect.kwargs)
+                else:
+                    result = await self.run_blocking(effect.fn, *effect.args, **effect.kwargs)
+            except asyncio.CancelledError:
+                steps.close()
+                raise
+            except Exception as e:
+                error = e
+
+    async def run(self) -> None:
+        """Main mining loop, the coroutine counterpart of mine_pond"""
+        while True:
+            await self.drive(self.session.cycle(self.skip_cooldown))
+
+
+async def mine_fleet(miner_configs: List[Dict[str, Any]], skip_cooldown: bool,
+                     db_manager: DatabaseManager) -> None:
+    """Supervise many miners in one process until SIGINT/SIGTERM"""
+    loop = asyncio.get_running_loop()
+    executor = ThreadPoolExecutor(max_workers=min(32, 2 * len(miner_configs) + 4),
+                                  thread_name_prefix="miner")
+    loop.set_default_executor(executor)
+
+    # Miners sharing a display share one mouse and keyboard
+    arbiters: Dict[Optional[str], InputArbiter] = {}
+    miners = []
+    for miner_config in miner_configs:
+        display = miner_config.get("display")
+        if display not in arbiters:
+            arbiters[display] = InputArbiter(executor, display or "desktop")
+            arbiters[display].start()
+        miners.append(AsyncMiner(MiningSession(miner_config, db_manager), skip_cooldown, arbiters[display], executor))
+
+    tasks = [asyncio.create_task(miner.run(), name=miner.name) for miner in miners]
+
+    def shutdown(signame: str) -> None:
+        logging.info(f"Received {signame}, stopping {len(tasks)} miners")
+        for task in tasks:
+            task.cancel()
+
+    for signum in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(signum, shutdown, signum.name)
+
+    try:
+        await asyncio.gather(*tasks, return_exceptions=True)
+    finally:
+        for signum in (signal.SIGINT, signal.SIGTERM):
+            loop.remove_signal_handler(signum)
+        for arbiter in arbiters.values():
+            await arbiter.stop()
+            logging.info(f"Input wait times on {arbiter.name}: {arbiter.summary() or 'none'}")
+        logging.info(f"OCR variant wins: {variant_stats()}")
+        # Work already handed to a thread can't be interrupted; drop the rest
+        executor.shutdown(wait=False, cancel_futures=True)
+        logging.info("All miners stopped")
+
+
+def run_fleet(miner_configs: List[Dict[str, Any]], skip_cooldown: bool,
+              db_manager: DatabaseManager) -> None:
+    asyncio.run(mine_fleet(miner_configs, skip_cooldown, db_manager))
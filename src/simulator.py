@@ -0,0 +1,629 @@
+import argparse
+import functools
+import json
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+import urllib.parse
+from collections import defaultdict
+from typing import Dict, Any, List, Optional, Tuple
+
+from PIL import Image, ImageDraw, ImageFont
+
+from arbiter import ACTION_DELAYS, ActionDelays
+from status import FLEET
+from config import MINER_BOX_SIZE, MINING_URL, logging
+from layout import DEFAULT_PROFILE
+
+# A miner panel is drawn on the default profile's reference box, so every
+# region get_miner_info crops lands on the text it expects
+PANEL_SIZE = (MINER_BOX_SIZE, 640)
+DEFAULT_FONT = "DejaVuSans.ttf"
+FONT_SIZE = 16
+LINE_HEIGHT = 20
+BACKGROUND = (17, 20, 38)
+TEXT = (236, 236, 245)
+BUTTON = (62, 84, 170)
+POPUP = (245, 245, 250)
+
+POINTS = DEFAULT_PROFILE["points"]
+REGIONS = DEFAULT_PROFILE["regions"]
+
+# (center x, center y, width, height); Mine and Stop & Claim share one spot
+MAIN_BUTTON = (POINTS["claim"]["x"], POINTS["claim"]["y"], 140, 36)
+CONFIRM_BUTTON = (POINTS["confirm_in_wallet"]["x"], POINTS["confirm_in_wallet"]["y"], 120, 40)
+# The logo leads home, and the home page's MINE tile back to the miner
+LOGO = (POINTS["logo"]["x"], POINTS["logo"]["y"], 80, 30)
+MINER_LINK = (POINTS["miner_link"]["x"], POINTS["miner_link"]["y"], 120, 60)
+
+HOME_URL = urllib.parse.urljoin(MINING_URL, "/")
+
+CLAIMING = "CLAIMING"
+MINING = "MINING"
+
+
+def load_font(size: int = FONT_SIZE, path: Optional[str] = None):
+    try:
+        return ImageFont.truetype(path or DEFAULT_FONT, size)
+    except OSError:
+        logging.warning(f"Font {path or DEFAULT_FONT} not found, using Pillow's default font")
+        return ImageFont.load_default(size)
+
+
+def button_box(button: Tuple[int, int, int, int]) -> Tuple[int, int, int, int]:
+    x, y, width, height = button
+    return (x - width // 2, y - height // 2, x + width // 2, y + height // 2)
+
+
+def inside(button: Tuple[int, int, int, int], x: float, y: float) -> bool:
+    left, top, right, bottom = button_box(button)
+    return left <= x <= right and top <= y <= bottom
+
+
+def format_duration(seconds: float) -> str:
+    seconds = int(seconds)
+    return f"{seconds // 3600}:{seconds % 3600 // 60:02d}:{seconds % 60:02d}"
+
+
+def format_time_waited(seconds: float) -> str:
+    """Coarse timer as the page shows it, e.g. "45s", "5m", "1h" """
+    seconds = int(seconds)
+    if seconds < 60:
+        return f"{seconds}s"
+    if seconds < 3600:
+        return f"{seconds // 60}m"
+    return f"{seconds // 3600}h"
+
+
+def panel_lines(view: Dict[str, Any]) -> List[str]:
+    """The panel's text, status line first, as OCR or a DevTools page read sees it"""
+    return [
+        f"Status: {view['status'].capitalize()}.",
+        f"Hashrate: {view['hashrate']:.2f} H/s",
+        f"Unclaimed: {view['unclaimed']:,.2f}",
+        f"Boost: {view['boost']:.2f}",
+        f"Time: {format_duration(view['time'])}",
+    ]
+
+
+def main_button_label(view: Dict[str, Any]) -> str:
+    return "Stop & Claim" if view["status"] == MINING else "Mine"
+
+
+def render_home(font=None) -> Image.Image:
+    """The home page: the logo and a MINE tile linking to the miner page"""
+    font = font or load_font()
+    img = Image.new("RGB", PANEL_SIZE, BACKGROUND)
+    draw = ImageDraw.Draw(img)
+    draw.text(LOGO[:2], "pond0x", font=font, fill=TEXT, anchor="mm")
+    draw.rounded_rectangle(button_box(MINER_LINK), radius=8, fill=BUTTON)
+    draw.text(MINER_LINK[:2], "MINE", font=font, fill=TEXT, anchor="mm")
+    return img
+
+
+def render_panel(view: Dict[str, Any], font=None) -> Image.Image:
+    """
+    Draw a miner panel for a status, hashrate, unclaimed, boost and time.
+    Keys of view: status, hashrate, unclaimed, boost, time and, optionally,
+    time_waited (shown while claiming), popup (wallet confirmation open)
+    and page ("home" draws the home page instead).
+    """
+    font = font or load_font()
+    if view.get("page") == "home":
+        return render_home(font)
+    img = Image.new("RGB", PANEL_SIZE, BACKGROUND)
+    draw = ImageDraw.Draw(img)
+    draw.text(LOGO[:2], "pond0x", font=font, fill=TEXT, anchor="mm")
+
+    status_region = REGIONS["status"]
+    x = status_region["x"] + 5
+    y = status_region["y"] + 8
+    status_line, *lines = panel_lines(view)
+    draw.text((x, y), status_line, font=font, fill=TEXT)
+    # Below the status region so status OCR sees a single line, and still
+    # inside the info region: 134 + 4 + 4 * 20 <= 220
+    y = status_region["y"] + status_region["h"] + 4
+    for line in lines:
+        draw.text((x, y), line, font=font, fill=TEXT)
+        y += LINE_HEIGHT
+
+    label = main_button_label(view)
+    draw.rounded_rectangle(button_box(MAIN_BUTTON), radius=8, fill=BUTTON)
+    draw.text(MAIN_BUTTON[:2], label, font=font, fill=TEXT, anchor="mm")
+
+    if view["status"] == CLAIMING and view.get("time_waited") is not None:
+        waited = REGIONS["time_waited"]
+        draw.text((waited["x"] + 5, waited["y"] + 4), format_time_waited(view["time_waited"]),
+                  font=font, fill=TEXT)
+
+    if view.get("popup"):
+        draw.rounded_rectangle(button_box(CONFIRM_BUTTON), radius=8, fill=POPUP)
+        draw.text(CONFIRM_BUTTON[:2], "Confirm", font=font, fill=BACKGROUND, anchor="mm")
+    return img
+
+
+class SimulatedMiner:
+    """
+    A scripted pond0x miner. Mine opens the wallet popup, Confirm starts a
+    session, and Stop & Claim ends it. The logo leads to the home page and
+    its MINE tile back to the miner page; sessions run on either. Mining again needs the cooldown once
+    mines_per_cooldown sessions have been used. Script events fire at a
+    fixed number of seconds into every session and may change hashrate,
+    reward_rate (unclaimed per second), boost or status.
+
+    Reaction time is measured from the moment the bot had a reason to act
+    to its click. The bot has a reason to claim when an event zeroes the
+    hashrate or reward rate, and a reason to mine when mining is possible
+    again.
+    """
+
+    def __init__(self, name: str, script: List[Dict[str, Any]], hashrate: float, reward_rate: float,
+                 boost: float = 0.0, cooldown: float = 1200, mines_per_cooldown: int = 1,
+                 popup_delay: float = 0.5):
+        self.name = name
+        self.script = sorted(script, key=lambda event: event["after"])
+        self.base_hashrate = hashrate
+        self.base_reward_rate = reward_rate
+        self.boost = boost
+        self.cooldown = cooldown
+        self.mines_per_cooldown = mines_per_cooldown
+        self.popup_delay = popup_delay
+        self.lock = threading.Lock()
+
+        now = time.time()
+        self.page = "miner"
+        self.status = CLAIMING
+        self.last_claim = now - cooldown
+        self.sessions_since_cooldown = 0
+        self.session_start: Optional[float] = None
+        self.popup_at: Optional[float] = None
+        self.hashrate = 0.0
+        self.reward_rate = 0.0
+        self.unclaimed = 0.0
+        self._accrued_at = now
+        self._pending: List[Dict[str, Any]] = []
+
+        self.expected: Optional[Tuple[str, float]] = ("mine", now)
+        self.reactions: List[float] = []
+        self.sessions = 0
+        self.claimed = 0.0
+
+    def _accrue(self, until: float) -> None:
+        if self.status == MINING and self.hashrate > 0:
+            self.unclaimed += self.reward_rate * (until - self._accrued_at)
+        self._accrued_at = until
+
+    def _expect(self, button: str, since: float) -> None:
+        if self.expected is None:
+            self.expected = (button, since)
+
+    def _react(self, button: str, now: float) -> None:
+        if self.expected and self.expected[0] == button:
+            self.reactions.append(max(0.0, now - self.expected[1]))
+            self.expected = None
+
+    def _apply(self, event: Dict[str, Any], at: float) -> None:
+        self._accrue(at)
+        for key in ("hashrate", "reward_rate", "boost"):
+            if key in event:
+                setattr(self, key, event[key])
+        if event.get("status") == CLAIMING:
+            self._end_session(at)
+        elif event.get("expect"):
+            self._expect(event["expect"], at)
+        elif event.get("hashrate") == 0 or event.get("reward_rate") == 0:
+            self._expect("claim", at)
+
+    def _end_session(self, now: float) -> None:
+        self.claimed += self.unclaimed
+        self.status = CLAIMING
+        self.last_claim = now
+        self.hashrate = 0.0
+        self._pending = []
+        self.expected = None
+        if self.sessions_since_cooldown < self.mines_per_cooldown:
+            self._expect("mine", now)
+        else:
+            self._expect("mine", now + self.cooldown)
+
+    def can_mine(self, now: float) -> bool:
+        return self.sessions_since_cooldown < self.mines_per_cooldown or now - self.last_claim >= self.cooldown
+
+    def advance(self, now: float) -> None:
+        """Fire the script events that are due and accrue rewards up to now"""
+        while self.status == MINING and self._pending and self.session_start + self._pending[0]["after"] <= now:
+            event = self._pending.pop(0)
+            self._apply(event, self.session_start + event["after"])
+        self._accrue(now)
+
+    def navigate(self, page: str) -> None:
+        with self.lock:
+            self.page = page
+            self.popup_at = None
+
+    def press(self, button: str, now: float) -> None:
+        with self.lock:
+            self.advance(now)
+            if self.page != "miner":
+                return
+            if button == "main" and self.status == MINING:
+                logging.debug(f"{self.name}: claimed {self.unclaimed:.2f}")
+                self._react("claim", now)
+                self._end_session(now)
+            elif button == "main" and self.can_mine(now):
+                self.popup_at = now + self.popup_delay
+            elif button == "confirm" and self.popup_at is not None and now >= self.popup_at:
+                if now - self.last_claim >= self.cooldown:
+                    self.sessions_since_cooldown = 0
+                self.sessions_since_cooldown += 1
+                self.sessions += 1
+                self.popup_at = None
+                self.status = MINING
+                self.session_start = self._accrued_at = now
+                self.hashrate = self.base_hashrate
+                self.reward_rate = self.base_reward_rate
+                self.unclaimed = 0.0
+                self._pending = list(self.script)
+                self._react("mine", now)
+
+    def view(self, now: float) -> Dict[str, Any]:
+        with self.lock:
+            self.advance(now)
+            mining = self.status == MINING
+            return {
+                "status": self.status,
+                "hashrate": self.hashrate,
+                "unclaimed": self.unclaimed if mining else 0.0,
+                "boost": self.boost,
+                "time": now - self.session_start if mining else 0,
+                "time_waited": None if mining else now - self.last_claim,
+                "popup": self.popup_at is not None and now >= self.popup_at,
+                "page": self.page,
+            }
+
+
+class SimulatedLane:
+    """
+    Capture and input lane over simulated miners, laid out like browser
+    windows on a display. Screenshots render only the miner under the
+    region, and clicks are hit-tested against its buttons.
+    """
+    modifier_key = "ctrl"
+
+    def __init__(self, font=None):
+        self.lock = threading.RLock()
+        self.font = font or load_font()
+        self.miners: List[Tuple[SimulatedMiner, int, int]] = []
+        self._position = (0, 0)
+        self.frames = 0
+
+    def add(self, miner: SimulatedMiner, x: int, y: int) -> None:
+        self.miners.append((miner, x, y))
+
+    def _miner_at(self, x: float, y: float) -> Optional[Tuple[SimulatedMiner, int, int]]:
+        for miner, left, top in self.miners:
+            if left <= x < left + PANEL_SIZE[0] and top <= y < top + PANEL_SIZE[1]:
+                return miner, left, top
+        return None
+
+    def capture_scale(self):
+        return 1.0
+
+    def grab(self):
+        width = max(left for _, left, _ in self.miners) + PANEL_SIZE[0]
+        height = max(top for _, _, top in self.miners) + PANEL_SIZE[1]
+        canvas = Image.new("RGB", (width, height))
+        now = time.time()
+        for miner, left, top in self.miners:
+            canvas.paste(render_panel(miner.view(now), self.font), (left, top))
+            self.frames += 1
+        return canvas
+
+    def screenshot(self, region):
+        left, top, width, height = region
+        hit = self._miner_at(left, top)
+        if hit is None:
+            return Image.new("RGB", (width, height))
+        miner, x, y = hit
+        self.frames += 1
+        frame = render_panel(miner.view(time.time()), self.font)
+        return frame.crop((left - x, top - y, left - x + width, top - y + height))
+
+    def move_to(self, x, y):
+        self._position = (x, y)
+        ACTION_DELAYS.settle("move")
+
+    def click(self, x=None, y=None, clicks=1):
+        if x is not None:
+            self._position = (x, y)
+        hit = self._miner_at(*self._position)
+        if hit is not None:
+            miner, left, top = hit
+            px, py = self._position[0] - left, self._position[1] - top
+            if inside(LOGO, px, py):
+                miner.navigate("home")
+            elif miner.page == "home":
+                if inside(MINER_LINK, px, py):
+                    miner.navigate("miner")
+            elif inside(MAIN_BUTTON, px, py):
+                miner.press("main", time.time())
+            elif inside(CONFIRM_BUTTON, px, py):
+                miner.press("confirm", time.time())
+        ACTION_DELAYS.settle("click" if clicks == 1 else "double_click")
+
+    def double_click(self, x=None, y=None):
+        # The page reacts to the first click of a double click only
+        self.click(x, y, clicks=2)
+
+    def scroll(self, clicks):
+        ACTION_DELAYS.settle("scroll")
+
+    def hotkey(self, *keys):
+        ACTION_DELAYS.settle("hotkey")
+
+    def typewrite(self, text):
+        ACTION_DELAYS.settle("typewrite")
+
+    def paste(self):
+        # The URL of the page under the last click, as copied from the address bar
+        hit = self._miner_at(*self._position)
+        return MINING_URL if hit is None or hit[0].page == "miner" else HOME_URL
+
+
+class SimulatedPage:
+    """
+    DevTools backend for one simulated miner, for hosts without tesseract.
+    Page reads return the panel's text and clicks by label press the
+    miner's button, like DevToolsPage does on the real page.
+    """
+
+    def __init__(self, miner: SimulatedMiner):
+        self.miner = miner
+
+    def current_url(self) -> str:
+        return MINING_URL if self.miner.page == "miner" else HOME_URL
+
+    def navigate(self, url: str = MINING_URL) -> None:
+        self.miner.navigate("miner" if url.rstrip("/") == MINING_URL.rstrip("/") else "home")
+
+    def page_text(self, selector: str = "body") -> str:
+        view = self.miner.view(time.time())
+        if view["page"] == "home":
+            return "pond0x\nMINE"
+        return "\n".join(panel_lines(view))
+
+    def click_text(self, label: str) -> bool:
+        now = time.time()
+        view = self.miner.view(now)
+        if view["page"] == "home":
+            if label.lower() not in "mine":
+                return False
+            self.miner.navigate("miner")
+            return True
+        if label.lower() not in main_button_label(view).lower():
+            return False
+        self.miner.press("main", now)
+        return True
+
+
+class CycleProbe:
+    """
+    Times the reads made by each miner's loop. A cycle starts at a status
+    read and includes every info read until the next one. This is the work
+    the loop does between sleeps. Each miner's loop CPU is the thread time
+    of its loop thread, sampled on every read.
+    """
+
+    def __init__(self):
+        self.cycles: Dict[str, List[float]] = defaultdict(list)
+        self.loop_cpu: Dict[str, float] = {}
+        self._current: Dict[str, float] = {}
+
+    def wrap(self, fn, starts_cycle: bool):
+        @functools.wraps(fn)
+        def timed(miner_config, *args, **kwargs):
+            name = miner_config["name"]
+            if starts_cycle and name in self._current:
+                self.cycles[name].append(self._current.pop(name))
+            start = time.perf_counter()
+            try:
+                return fn(miner_config, *args, **kwargs)
+            finally:
+                self._current[name] = self._current.get(name, 0.0) + time.perf_counter() - start
+                self.loop_cpu[name] = time.thread_time()
+        return timed
+
+
+# Waits in MiningConfig that are divided by the speedup
+SCALED_TIMINGS = ("COOLDOWN_WAIT_TIME", "MINING_CHECK_INTERVAL", "GENERAL_WAIT_TIME", "RETRY_WAIT_TIME",
+                  "STALL_CHECK_TIME", "OCR_RECAPTURE_WAIT", "RESTART_OVERHEAD", "CHECKPOINT_INTERVAL")
+
+
+def default_script(rng: random.Random, session_length: float) -> List[Dict[str, Any]]:
+    """Hashrate drops to zero some time into each session, and some sessions stall first"""
+    length = session_length * rng.uniform(0.5, 1.5)
+    script = [{"after": length, "hashrate": 0}]
+    if rng.random() < 0.3:
+        script.append({"after": length * 0.6, "reward_rate": 0})
+    return script
+
+
+def percentile(values: List[float], fraction: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+def run_harness(miner_count: int, duration: float, speedup: float = 60, shared_lane: bool = False,
+                script: Optional[List[Dict[str, Any]]] = None, db_path: Optional[str] = None,
+                seed: int = 0, font_path: Optional[str] = None,
+                page_text: bool = False) -> Dict[str, Dict[str, float]]:
+    """
+    Run the full mine_pond loop against simulated miners for duration
+    seconds and return per-miner metrics. Every wait in MiningConfig and
+    every input delay is divided by speedup so a long session fits into a
+    short run. Script times are in wall seconds. With page_text, miners
+    are read and clicked through a simulated DevTools page instead of OCR.
+    """
+    import utils
+    from cooldown import PLANNER
+    from db_utils import DatabaseManager
+    from minepond import MiningConfig, mine_pond
+
+    for name in SCALED_TIMINGS:
+        setattr(MiningConfig, name, getattr(MiningConfig, name) / speedup)
+    PLANNER.cooldown /= speedup
+    PLANNER.min_gap /= speedup
+    ACTION_DELAYS.DEFAULTS = {action: delay / speedup for action, delay in ActionDelays.DEFAULTS.items()}
+
+    probe = CycleProbe()
+    utils.get_miner_status = probe.wrap(utils.get_miner_status, starts_cycle=True)
+    utils.get_miner_info = probe.wrap(utils.get_miner_info, starts_cycle=False)
+
+    db_manager = DatabaseManager(db_path or os.path.join(tempfile.mkdtemp(), "simulation.db"))
+    db_manager.init_db()
+
+    rng = random.Random(seed)
+    font = load_font(path=font_path)
+    session_length = 6 * MiningConfig.MINING_CHECK_INTERVAL
+    shared = SimulatedLane(font)
+    miners = []
+    for index in range(miner_count):
+        name = f"sim-{index}"
+        miner = SimulatedMiner(
+            name,
+            script if script is not None else default_script(rng, session_length),
+            hashrate=rng.uniform(5, 50),
+            # Enough to clear the reward threshold within a typical session
+            reward_rate=rng.uniform(1.5, 5) * MiningConfig.MIN_REWARD_THRESHOLD / session_length,
+            boost=rng.choice([0.0, 1.0, 1.5, 2.0]),
+            cooldown=MiningConfig.COOLDOWN_WAIT_TIME,
+            # Inside the wallet_popup delay, so wait_for_change sees it open
+            popup_delay=ACTION_DELAYS.DEFAULTS["wallet_popup"] / 2,
+        )
+        if shared_lane:
+            lane_name, lane = "sim", shared
+            x, y = (index % 4) * (PANEL_SIZE[0] + 20), (index // 4) * (PANEL_SIZE[1] + 20)
+        else:
+            lane_name, lane = name, SimulatedLane(font)
+            x, y = 0, 0
+            utils.register_lane(lane_name, lane)
+        lane.add(miner, x, y)
+        miner_config = {
+            "name": name,
+            "display": lane_name,
+            "miner_window_offset": {"x": x, "y": y},
+            "capture_scale": 1,
+            "mining_per_cooldown": 1,
+        }
+        if page_text:
+            miner_config["devtools"] = {"selector": "body"}
+            utils.register_devtools_page(name, SimulatedPage(miner))
+        miners.append((miner, lane, miner_config))
+    if shared_lane:
+        utils.register_lane("sim", shared)
+
+    logging.info(f"Simulating {miner_count} miners for {duration:.0f}s at {speedup:g}x "
+                 f"({'one shared lane' if shared_lane else 'one lane each'})")
+    cpu_start, wall_start = time.process_time(), time.time()
+    for miner, _, miner_config in miners:
+        threading.Thread(target=mine_pond, args=(miner_config, False, db_manager),
+                         name=miner.name, daemon=True).start()
+    time.sleep(duration)
+    cpu_used = time.process_time() - cpu_start
+    wall = time.time() - wall_start
+
+    results = {}
+    for miner, lane, _ in miners:
+        cycles = probe.cycles.get(miner.name, [])
+        results[miner.name] = {
+            "sessions": miner.sessions,
+            "cycles": len(cycles),
+            "cycle_p50": percentile(cycles, 0.5),
+            "cycle_p95": percentile(cycles, 0.95),
+            "reactions": len(miner.reactions),
+            "reaction_mean": sum(miner.reactions) / len(miner.reactions) if miner.reactions else 0.0,
+            "reaction_max": max(miner.reactions, default=0.0),
+            "loop_cpu": probe.loop_cpu.get(miner.name, 0.0),
+            "errors": (FLEET.get(miner.name) or {}).get("errors") or 0,
+            # OCR runs on a shared pool, so only the process total can be split fairly
+            "cpu_share": cpu_used / miner_count / wall * 100,
+        }
+    return results
+
+
+def print_report(results: Dict[str, Dict[str, float]]) -> None:
+    print("\n=== Simulation ===\n")
+    print("-" * 110)
+    print(f"{'Miner':<10} {'Sessions':<10} {'Cycles':<8} {'Cycle p50':<11} {'Cycle p95':<11} "
+          f"{'Reactions':<11} {'React mean':<12} {'React max':<11} {'Loop CPU':<10} {'Errors':<8}")
+    print("-" * 110)
+    for name, result in results.items():
+        print(f"{name:<10} {result['sessions']:<10} {result['cycles']:<8} {result['cycle_p50']:<11.2f} "
+              f"{result['cycle_p95']:<11.2f} {result['reactions']:<11} {result['reaction_mean']:<12.2f} "
+              f"{result['reaction_max']:<11.2f} {result['loop_cpu']:<10.2f} {result['errors']:<8}")
+    cycles = [result["cycle_p95"] for result in results.values() if result["cycles"]]
+    reactions = [result["reaction_max"] for result in results.values() if result["reactions"]]
+    print("\nOverall:")
+    print("-" * 110)
+    print(f"Worst cycle p95: {max(cycles, default=0.0):.2f}s")
+    print(f"Worst reaction: {max(reactions, default=0.0):.2f}s")
+    print(f"Mining loop errors: {sum(result['errors'] for result in results.values())}")
+    print(f"CPU per miner: {next(iter(results.values()))['cpu_share'] if results else 0.0:.1f}% of a core")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the mining loop against simulated miners")
+    parser.add_argument("miners", type=int, nargs='?', default=20, help="Number of simulated miners")
+    parser.add_argument("--duration", type=float, default=300, help="Wall seconds to run for")
+    parser.add_argument("--speedup", type=float, default=60, help="Divide every mining wait by this")
+    parser.add_argument("--shared-lane", action="store_true", help="Put every miner on one lane, like one desktop")
+    parser.add_argument("--script", type=str,
+                        help="JSON list of events applied to every session, inline or in a file")
+    parser.add_argument("--font", type=str, help="TrueType font to draw panels with")
+    parser.add_argument("--db-path", type=str, help="Database for the simulated sessions (default: temporary)")
+    parser.add_argument("--seed", type=int, default=0, help="Seed for the generated miners and scripts")
+    parser.add_argument("--frames", type=str, help="Save sample frames to this directory and exit")
+    parser.add_argument("--page-text", action="store_true", help="Read miners through a simulated DevTools page, not OCR")
+    args = parser.parse_args()
+
+    if args.frames:
+        os.makedirs(args.frames, exist_ok=True)
+        font = load_font(path=args.font)
+        samples = {
+            "mining": {"status": MINING, "hashrate": 23.5, "unclaimed": 1234.56, "boost": 1.5, "time": 4321},
+            "claiming": {"status": CLAIMING, "hashrate": 0.0, "unclaimed": 0.0, "boost": 1.5, "time": 0,
+                         "time_waited": 300},
+            "confirm": {"status": CLAIMING, "hashrate": 0.0, "unclaimed": 0.0, "boost": 0.0, "time": 0,
+                        "time_waited": 1500, "popup": True},
+        }
+        for name, view in samples.items():
+            render_panel(view, font).save(os.path.join(args.frames, f"{name}.png"))
+        print(f"Saved {len(samples)} frames to {args.frames}")
+        return
+
+    script = None
+    if args.script:
+        if os.path.isfile(args.script):
+            with open(args.script, 'r') as file:
+                script = json.load(file)
+        else:
+            script = json.loads(args.script)
+
+    # pyautogui connects to $DISPLAY on import, even though simulated lanes never use it
+    if sys.platform.startswith("linux") and "DISPLAY" not in os.environ:
+        from displays import VirtualDisplay
+        display = VirtualDisplay(":99")
+        display.start()
+        os.environ["DISPLAY"] = display.name
+
+    print_report(run_harness(args.miners, args.duration, args.speedup, args.shared_lane, script,
+                             args.db_path, args.seed, args.font, args.page_text))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,135 @@
+import re
+import time
+from typing import Dict, Any, Iterator, List, Optional
+
+
+def parse_unclaimed(value: Any) -> float:
+    """Unclaimed rewards as shown on the page (e.g. "1,234.5") to a float"""
+    if isinstance(value, (int, float)):
+        return float(value)
+    digits = re.sub(r'[^\d.]', '', value or "")
+    return float(digits) if digits else 0.0
+
+
+class MinerSnapshot:
+    """One reading of the miner panel, parsed once when it was captured"""
+    __slots__ = ("timestamp", "status", "hashrate", "unclaimed", "boost", "time_mined")
+
+    def __init__(self, timestamp: float, status: str, hashrate: float,
+                 unclaimed: float, boost: float, time_mined: int):
+        self.timestamp = timestamp
+        self.status = status
+        self.hashrate = hashrate
+        self.unclaimed = unclaimed
+        self.boost = boost
+        self.time_mined = time_mined
+
+    @classmethod
+    def from_mining_info(cls, mining_info: Dict[str, Any], timestamp: Optional[float] = None) -> "MinerSnapshot":
+        return cls(
+            timestamp=time.time() if timestamp is None else timestamp,
+            status=mining_info.get("status", "UNKNOWN"),
+            hashrate=float(mining_info.get("hashrate", 0.0)),
+            unclaimed=parse_unclaimed(mining_info.get("unclaimed")),
+            boost=float(mining_info.get("boost", 0.0)),
+            time_mined=int(mining_info.get("time", 0)),
+        )
+
+    def as_list(self) -> List[Any]:
+        return [getattr(self, slot) for slot in self.__slots__]
+
+    def __repr__(self) -> str:
+        return (f"MinerSnapshot(status={self.status}, hashrate={self.hashrate}, "
+                f"unclaimed={self.unclaimed}, boost={self.boost}, time_mined={self.time_mined})")
+
+
+class SnapshotRing:
+    """
+    Fixed-capacity history of a miner's snapshots for the current session.
+    Appends overwrite the oldest slot, and the running hashrate sum and the
+    time of the last unclaimed change are maintained on append, so every
+    query is O(1) and memory stays bounded however long the miner runs.
+    """
+
+    def __init__(self, capacity: int = 64):
+        self.capacity = capacity
+        self._slots: List[Optional[MinerSnapshot]] = [None] * capacity
+        self.clear()
+
+    def clear(self) -> None:
+        for i in range(self.capacity):
+            self._slots[i] = None
+        self._next = 0
+        self._count = 0
+        self._hashrate_sum = 0.0
+        self.last_change_time: Optional[float] = None
+
+    def __len__(self) -> int:
+        return self._count
+
+    def append(self, snapshot: MinerSnapshot) -> None:
+        evicted = self._slots[self._next]
+        if evicted is not None:
+            self._hashrate_sum -= evicted.hashrate
+        previous = self.latest
+
+        self._slots[self._next] = snapshot
+        self._next = (self._next + 1) % self.capacity
+        self._count = min(self._count + 1, self.capacity)
+        self._hashrate_sum += snapshot.hashrate
+
+        if previous is None or snapshot.unclaimed != previous.unclaimed:
+            self.last_change_time = snapshot.timestamp
+
+    @property
+    def latest(self) -> Optional[MinerSnapshot]:
+        if not self._count:
+            return None
+        return self._slots[(self._next - 1) % self.capacity]
+
+    @property
+    def oldest(self) -> Optional[MinerSnapshot]:
+        if not self._count:
+            return None
+        return self._slots[(self._next - self._count) % self.capacity]
+
+    def __iter__(self) -> Iterator[MinerSnapshot]:
+        """Snapshots from oldest to newest"""
+        for i in range(self._count):
+            yield self._slots[(self._next - self._count + i) % self.capacity]
+
+    def dump(self) -> Dict[str, Any]:
+        """Plain-data copy of the buffer, for checkpointing"""
+        return {"snapshots": [snapshot.as_list() for snapshot in self],
+                "last_change_time": self.last_change_time}
+
+    def restore(self, state: Dict[str, Any]) -> None:
+        self.clear()
+        for values in state.get("snapshots", [])[-self.capacity:]:
+            self.append(MinerSnapshot(*values))
+        self.last_change_time = state.get("last_change_time", self.last_change_time)
+
+    def average_hashrate(self) -> float:
+        return self._hashrate_sum / self._count if self._count else 0.0
+
+    def reward_rate(self) -> float:
+        """Unclaimed rewards gained per hour across the buffered window"""
+        oldest, latest = self.oldest, self.latest
+        if oldest is None or latest.timestamp <= oldest.timestamp:
+            return 0.0
+        return (latest.unclaimed - oldest.unclaimed) / (latest.timestamp - oldest.timestamp) * 3600
+
+    def recent_reward_rate(self, window: int = 3) -> float:
+        """Unclaimed rewards gained per hour over the last window intervals between snapshots"""
+        if self._count < 2:
+            return 0.0
+        latest = self.latest
+        earlier = self._slots[(self._next - 1 - min(window, self._count - 1)) % self.capacity]
+        if latest.timestamp <= earlier.timestamp:
+            return 0.0
+        return (latest.unclaimed - earlier.unclaimed) / (latest.timestamp - earlier.timestamp) * 3600
+
+    def time_since_unclaimed_change(self, now: Optional[float] = None) -> float:
+        if self.last_change_time is None:
+            return 0.0
+        return (time.time() if now is None else now) - self.last_change_time
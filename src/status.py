@@ -0,0 +1,243 @@
+import atexit
+import glob
+import json
+import os
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Any, List, Optional
+from urllib.parse import unquote
+
+from config import logging
+
+DEFAULT_FEED_PATH = "out/status.jsonl"
+
+# Fields published for every miner, in display order
+STATUS_FIELDS = (
+    "state", "hashrate", "avg_hashrate", "unclaimed", "reward_rate", "next_wakeup",
+    "cooldown_count", "session_id", "claims", "errors", "last_snapshot", "last_error", "updated_at",
+)
+
+
+def process_feed_path(path: str, pid: Optional[int] = None) -> str:
+    """The feed one process writes: out/status.jsonl -> out/status.<pid>.jsonl"""
+    stem, ext = os.path.splitext(path)
+    return f"{stem}.{os.getpid() if pid is None else pid}{ext}"
+
+
+def feed_paths(path: str) -> List[str]:
+    """Every process's feed for a feed path"""
+    stem, ext = os.path.splitext(path)
+    return sorted(glob.glob(f"{glob.escape(stem)}.*{ext}"))
+
+
+class FleetStatus:
+    """
+    In-memory state of every miner in this process.
+    Updates are cheap dict writes; when a feed is enabled, each update is
+    also appended to it as one JSON line holding only the changed fields, so
+    other processes can follow along without touching the database.
+    Each process writes its own feed file, so compacting it only ever
+    rewrites miners this process owns.
+    """
+
+    def __init__(self):
+        self._miners: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+        self.version = 0
+        self._feed_path: Optional[str] = None
+        self._feed_max_bytes = 0
+        self._json = b""
+        self._json_version = -1
+
+    def enable_feed(self, path: str = DEFAULT_FEED_PATH, max_bytes: int = 10 * 1024 * 1024) -> None:
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self._feed_path = process_feed_path(path)
+        self._feed_max_bytes = max_bytes
+        atexit.register(self.close_feed)
+
+    def close_feed(self) -> None:
+        """Stop writing the feed and remove it, so readers drop this process's miners"""
+        with self._lock:
+            path, self._feed_path = self._feed_path, None
+        if path:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+    def update(self, name: str, **fields: Any) -> None:
+        with self._lock:
+            self._update(name, fields)
+
+    def increment(self, name: str, field: str) -> None:
+        with self._lock:
+            value = (self._miners.get(name) or {}).get(field) or 0
+            self._update(name, {field: value + 1})
+
+    def _update(self, name: str, fields: Dict[str, Any]) -> None:
+        # Callers hold the lock
+        fields["updated_at"] = time.time()
+        miner = self._miners.setdefault(name, dict.fromkeys(STATUS_FIELDS))
+        miner.update(fields)
+        self.version += 1
+        if self._feed_path:
+            self._append_feed({"name": name, **fields})
+
+    def get(self, name: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            miner = self._miners.get(name)
+            return dict(miner) if miner else None
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        with self._lock:
+            return {name: dict(miner) for name, miner in self._miners.items()}
+
+    def snapshot_json(self) -> bytes:
+        """The whole fleet as JSON, re-encoded only when something changed since the last call"""
+        with self._lock:
+            if self._json_version != self.version:
+                body = {"version": self.version, "miners": self._miners}
+                self._json = json.dumps(body, default=str).encode()
+                self._json_version = self.version
+            return self._json
+
+    def _append_feed(self, record: Dict[str, Any]) -> None:
+        try:
+            if os.path.exists(self._feed_path) and os.path.getsize(self._feed_path) > self._feed_max_bytes:
+                self._compact_feed()
+            with open(self._feed_path, "a") as feed:
+                feed.write(json.dumps(record, default=str) + "\n")
+        except OSError as e:
+            logging.warning(f"Could not write status feed: {e}")
+
+    def _compact_feed(self) -> None:
+        """Replace the feed with one full line per miner; readers notice the new file"""
+        tmp_path = f"{self._feed_path}.tmp"
+        with open(tmp_path, "w") as feed:
+            for name, miner in self._miners.items():
+                feed.write(json.dumps({"name": name, **miner}, default=str) + "\n")
+        os.replace(tmp_path, self._feed_path)
+
+
+class FeedFile:
+    """Follows one process's feed, applying only the lines added since the last poll"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self.miners: Dict[str, Dict[str, Any]] = {}
+        self._offset = 0
+        self._inode: Optional[int] = None
+
+    def poll(self) -> set:
+        """Returns the names of miners that changed"""
+        try:
+            stat = os.stat(self.path)
+        except FileNotFoundError:
+            return set()
+        changed = set()
+        if stat.st_ino != self._inode or stat.st_size < self._offset:
+            # The feed was compacted or recreated, start over
+            self._inode = stat.st_ino
+            self._offset = 0
+            changed.update(self.miners)
+            self.miners.clear()
+        if stat.st_size == self._offset:
+            return changed
+
+        with open(self.path, "r") as feed:
+            feed.seek(self._offset)
+            for line in feed:
+                if not line.endswith("\n"):
+                    break  # Partially written, pick it up next time
+                self._offset += len(line.encode())
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    continue
+                name = record.pop("name")
+                self.miners.setdefault(name, dict.fromkeys(STATUS_FIELDS)).update(record)
+                changed.add(name)
+        return changed
+
+
+class FeedReader:
+    """
+    Merges the feeds of every process writing under a feed path. A miner
+    restarted in a new process shows the state from whichever feed updated
+    it last.
+    """
+
+    def __init__(self, path: str = DEFAULT_FEED_PATH):
+        self.path = path
+        self.miners: Dict[str, Dict[str, Any]] = {}
+        self._feeds: Dict[str, FeedFile] = {}
+
+    def poll(self) -> set:
+        """Returns the names of miners that changed"""
+        changed = set()
+        paths = set(feed_paths(self.path))
+        for path in set(self._feeds) - paths:
+            # The process exited and removed its feed
+            changed.update(self._feeds.pop(path).miners)
+        for path in paths:
+            feed = self._feeds.setdefault(path, FeedFile(path))
+            changed.update(feed.poll())
+
+        for name in changed:
+            latest = max((feed.miners[name] for feed in self._feeds.values() if name in feed.miners),
+                         key=lambda miner: miner.get("updated_at") or 0, default=None)
+            if latest is None:
+                self.miners.pop(name, None)
+            else:
+                self.miners[name] = latest
+        return changed
+
+
+class StatusHandler(BaseHTTPRequestHandler):
+    """
+    GET /miners for the whole fleet, /miners/<name> for one miner and
+    /health for a liveness check. Everything is served from FleetStatus,
+    never the database.
+    """
+    fleet: FleetStatus
+
+    def do_GET(self) -> None:
+        path = self.path.split("?", 1)[0].rstrip("/")
+        if path in ("", "/miners"):
+            self._send(200, self.fleet.snapshot_json())
+        elif path.startswith("/miners/"):
+            miner = self.fleet.get(unquote(path[len("/miners/"):]))
+            if miner is None:
+                self._send(404, b'{"error": "unknown miner"}')
+            else:
+                self._send(200, json.dumps(miner, default=str).encode())
+        elif path == "/health":
+            self._send(200, json.dumps({"ok": True, "version": self.fleet.version}).encode())
+        else:
+            self._send(404, b'{"error": "not found"}')
+
+    def _send(self, code: int, body: bytes) -> None:
+        self.send_response(code)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format: str, *args: Any) -> None:
+        # Monitoring polls often, keep it out of the mining log
+        pass
+
+
+def serve_status(fleet: FleetStatus, port: int, host: str = "127.0.0.1") -> ThreadingHTTPServer:
+    """Serve the fleet's status over HTTP from a background thread"""
+    handler = type("FleetStatusHandler", (StatusHandler,), {"fleet": fleet})
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, name="status-api", daemon=True).start()
+    logging.info(f"Serving miner status on http://{host}:{server.server_address[1]}/miners")
+    return server
+
+
+# Shared by every miner in the process
+FLEET = FleetStatus()
@@ -0,0 +1,49 @@
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Generator, Tuple
+
+
+@dataclass
+class Sleep:
+    seconds: float
+
+
+@dataclass
+class Input:
+    """A mouse and keyboard macro; the asyncio runtime queues it on the lane's arbiter"""
+    name: str
+    priority: int
+    fn: Callable
+    args: Tuple = ()
+    kwargs: Dict[str, Any] = field(default_factory=dict)
+
+
+@dataclass
+class Call:
+    """Blocking work such as capture, OCR or database access"""
+    fn: Callable
+    args: Tuple = ()
+    kwargs: Dict[str, Any] = field(default_factory=dict)
+
+
+# A miner step yields Sleep, Input and Call effects and receives each one's
+# result back, so the same logic runs under mine_pond and the asyncio runtime
+Steps = Generator[Any, Any, Any]
+
+
+def run_steps(steps: Steps) -> Any:
+    """Drive steps by blocking: sleeps are time.sleep and effects run inline"""
+    result, error = None, None
+    while True:
+        try:
+            effect = steps.throw(error) if error else steps.send(result)
+        except StopIteration as stop:
+            return stop.value
+        result, error = None, None
+        try:
+            if isinstance(effect, Sleep):
+                time.sleep(effect.seconds)
+            else:
+                result = effect.fn(*effect.args, **effect.kwargs)
+        except Exception as e:
+            error = e
@@ -6,14 +6,26 @@ import json
 import argparse
 import logging
 import pyperclip
+import sys
+import threading
 import time
 
 from config import MINING_URL, OUTPUT_DIR, logging
+from layout import MinerLayout, register_profiles, resolve_layout
+from displays import XDisplayLane
+from devtools import DEFAULT_BUTTON_TEXT, page_for_miner
+from arbiter import ACTION_DELAYS
+from ocr import parse_time_to_seconds, read_mining_info
 
-pyautogui.PAUSE = 1.5
+# Delays are applied per action by the lanes, see arbiter.ActionDelays
+pyautogui.PAUSE = 0
 
 seconds_per_unit = {"s": 1, "m": 60, "h": 3600, "d": 86400, "w": 604800}
 
+_capture_scale = None
+_lanes = {}
+_devtools_pages = {}
+
 def take_screenshot(output_dir=OUTPUT_DIR):
     # Capture the entire screen
     screenshot = ImageGrab.grab()
@@ -23,13 +35,162 @@ def take_screenshot(output_dir=OUTPUT_DIR):
 def get_screen_size():
     return ImageGrab.grab().size
 
-def click_on_screen(x, y, double_click=True):
-    logging.info(f"Clicking on ({x}, {y})")
-    pyautogui.moveTo(x, y)
-    if double_click:
+def get_capture_scale():
+    """Ratio of captured image pixels to logical screen points (2.0 on Retina displays)"""
+    global _capture_scale
+    if _capture_scale is None:
+        _capture_scale = get_screen_size()[0] / pyautogui.size()[0]
+        logging.info(f"Detected capture scale: {_capture_scale}")
+    return _capture_scale
+
+class ScreenLane:
+    """Capture and input on the local desktop through pyautogui"""
+    modifier_key = "command" if sys.platform == "darwin" else "ctrl"
+
+    def __init__(self):
+        self.lock = threading.RLock()
+
+    def capture_scale(self):
+        return get_capture_scale()
+
+    def grab(self):
+        return ImageGrab.grab()
+
+    def screenshot(self, region):
+        return pyautogui.screenshot(region=region)
+
+    def move_to(self, x, y):
+        pyautogui.moveTo(x, y)
+        ACTION_DELAYS.settle("move")
+
+    def click(self, x=None, y=None, clicks=1):
+        pyautogui.click(x, y, clicks=clicks)
+        ACTION_DELAYS.settle("click" if clicks == 1 else "double_click")
+
+    def double_click(self, x=None, y=None):
         pyautogui.doubleClick(x, y)
-    else:
-        pyautogui.click(x, y)
+        ACTION_DELAYS.settle("double_click")
+
+    def scroll(self, clicks):
+        pyautogui.scroll(clicks)
+        ACTION_DELAYS.settle("scroll")
+
+    def hotkey(self, *keys):
+        pyautogui.hotkey(*keys)
+        ACTION_DELAYS.settle("hotkey")
+
+    def typewrite(self, text):
+        pyautogui.typewrite(text)
+        ACTION_DELAYS.settle("typewrite")
+
+    def paste(self):
+        return pyperclip.paste()
+
+def get_lane(miner_config=None):
+    """
+    Capture and input lane for a miner. Miners placed on a virtual display
+    get a lane bound to that display, everything else shares the desktop.
+    """
+    display_name = (miner_config or {}).get("display")
+    if display_name not in _lanes:
+        _lanes[display_name] = XDisplayLane(display_name) if display_name else ScreenLane()
+    return _lanes[display_name]
+
+def register_lane(display_name, lane):
+    """Bind miners whose "display" is display_name to a custom lane, e.g. a simulated one"""
+    _lanes[display_name] = lane
+
+def register_devtools_page(miner_name, page):
+    """Use page as the miner's DevTools backend, e.g. a simulated one"""
+    _devtools_pages[miner_name] = page
+
+def get_layout(miner_config) -> MinerLayout:
+    capture_scale = miner_config.get("capture_scale") or get_lane(miner_config).capture_scale()
+    return resolve_layout(miner_config, capture_scale)
+
+def capture_region(layout: MinerLayout, region_name, lane=None):
+    """
+    Capture an OCR region of a miner. When the capture is scaled relative to
+    logical coordinates, crop the scaled box and bring it back to logical size
+    so OCR sees the same image on every display.
+    """
+    return capture(layout, layout.region(region_name), lane)
+
+def capture(layout: MinerLayout, region, lane=None):
+    lane = lane or get_lane()
+    if layout.capture_scale == 1:
+        return lane.screenshot(region)
+    screenshot = lane.grab().crop(layout.scale_box(region))
+    return screenshot.resize((region[2], region[3]), Image.LANCZOS)
+
+def capture_around(miner_config, point_name, size=40):
+    """Capture a small square around a layout point, e.g. where a popup will appear"""
+    point = get_layout(miner_config).point(point_name)
+    region = (point["x"] - size // 2, point["y"] - size // 2, size, size)
+    return capture(get_layout(miner_config), region, get_lane(miner_config))
+
+def wait_for_change(miner_config, point_name, baseline, action):
+    """Wait until the area around a layout point differs from baseline, calibrating the action's delay"""
+    def changed():
+        return capture_around(miner_config, point_name, baseline.size[0]).tobytes() != baseline.tobytes()
+    return ACTION_DELAYS.measure(action, changed)
+
+def wait_for_region_change(miner_config, region_name, baseline, action):
+    """Wait until an OCR region differs from baseline, e.g. the status line after navigating"""
+    layout, lane = get_layout(miner_config), get_lane(miner_config)
+    def changed():
+        return capture_region(layout, region_name, lane).tobytes() != baseline.tobytes()
+    return ACTION_DELAYS.measure(action, changed)
+
+def get_devtools_page(miner_config):
+    name = miner_config.get("name")
+    if name not in _devtools_pages:
+        _devtools_pages[name] = page_for_miner(miner_config)
+    return _devtools_pages[name]
+
+def try_devtools(miner_config, action, description):
+    """
+    Run action(page) against the miner's DevTools page.
+    Returns None when the miner has no DevTools backend or the call fails,
+    so callers fall back to the screen.
+    """
+    page = get_devtools_page(miner_config)
+    if page is None:
+        return None
+    try:
+        return action(page)
+    except Exception as e:
+        logging.warning(f"DevTools {description} failed, falling back to screen: {e}")
+        return None
+
+def devtools_text(miner_config):
+    devtools_config = miner_config.get("devtools")
+    if not devtools_config:
+        return None
+    selector = devtools_config.get("selector", "body")
+    return try_devtools(miner_config, lambda page: page.page_text(selector), "page read")
+
+def button_labels(miner_config):
+    return {**DEFAULT_BUTTON_TEXT, **(miner_config.get("devtools") or {}).get("buttons", {})}
+
+def click_button(miner_config, button_name, double_click=True, lane=None):
+    """Click a miner page button through the DOM when possible, otherwise on screen"""
+    button_text = button_labels(miner_config)
+    if button_name in button_text:
+        if try_devtools(miner_config, lambda page: page.click_text(button_text[button_name]), f"click on {button_name}"):
+            logging.info(f"Clicked {button_name} through DevTools")
+            return
+    click_on_screen(**get_layout(miner_config).point(button_name), double_click=double_click, lane=lane)
+
+def click_on_screen(x, y, double_click=True, lane=None):
+    logging.info(f"Clicking on ({x}, {y})")
+    lane = lane or get_lane()
+    with lane.lock:
+        lane.move_to(x, y)
+        if double_click:
+            lane.double_click(x, y)
+        else:
+            lane.click(x, y)
 
 def find_button_coordinates(btn_name):
     image_path = f"assets/{btn_name}_btn.png"
@@ -46,23 +207,10 @@ def preprocess_image(img: Image.Image):
     img = ImageEnhance.Sharpness(img).enhance(2)
     return img
 
-def parse_time_to_seconds(time_str):
-    time_parts = time_str.split(':')
-    if len(time_parts) == 1:
-        return int(time_parts[0])  # seconds
-    elif len(time_parts) == 2:
-        return int(time_parts[0]) * 60 + int(time_parts[1])  # minutes:seconds
-    elif len(time_parts) == 3:
-        return int(time_parts[0]) * 3600 + int(time_parts[1]) * 60 + int(time_parts[2])  # hours:minutes:seconds
-    else:
-        logging.warning(f"Unexpected time format: {time_str}")
-        return 0
-
 def grab_mining_info(status_img):
-    preprocessed_img = preprocess_image(status_img)
-    text = pytesseract.image_to_string(status_img, config="--psm 6")
-    logging.debug(f"OCR Text: {text}")
-    
+    return read_mining_info(status_img)
+
+def parse_mining_text(text):
     info = {}
     for line in text.split('\n'):
         if ':' in line:
@@ -89,26 +237,33 @@ def grab_mining_info(status_img):
     logging.info(f"Mining info: {info}")
     return info
 
+def parse_status_text(text):
+    for line in text.split('\n'):
+        if ':' in line:
+            key, value = line.split(':', 1)
+            if key.strip().lower() == 'status':
+                return value.strip().replace(".", "").upper()
+            else:
+                logging.debug(f"Skipping line: {key} with value: {value}")
+        if line.lower().strip()  == "joining":
+            return "joining"
+    return None
+
 def get_miner_status(miner_config):
-    miner_window_offset = miner_config["miner_window_offset"]
-    x = miner_window_offset["x"] + 90
-    y = miner_window_offset["y"] + 92
-    w = 380
-    h = 21 * 2
-    screenshot = pyautogui.screenshot(region=(x, y, w, h))
+    text = devtools_text(miner_config)
+    if text is not None:
+        status = parse_status_text(text)
+        if status:
+            return status
+        logging.warning("STATUS not found in page text, falling back to OCR")
+
+    screenshot = capture_region(get_layout(miner_config), "status", get_lane(miner_config))
     try:
         text = pytesseract.image_to_string(screenshot)
         logging.debug(f"OCR Text: {text}")
-        for line in text.split('\n'):
-            if ':' in line:
-                key, value = line.split(':', 1)
-                if key.lower() == 'status':
-                    return value.strip().replace(".", "").upper()
-                else:
-                    logging.debug(f"Skipping line: {key} with value: {value}")
-            if line.lower().strip()  == "joining":
-                return "joining"
-            
+        status = parse_status_text(text)
+        if status:
+            return status
         raise Exception("STATUS not found in OCR text")
     except Exception as e:
         screenshot_path = f"{OUTPUT_DIR}/miner_status_{datetime.datetime.now().strftime('%Y-%m-%d_%H-%M-%S')}.png"
@@ -125,12 +280,7 @@ def convert_to_seconds(s):
     return int(s[:-1]) * seconds_per_unit[s[-1]]
 
 def get_time_waited(miner_config):
-    miner_window_offset = miner_config["miner_window_offset"]
-    x = miner_window_offset["x"] + 433
-    y = miner_window_offset["y"] + 328
-    w = 60
-    h = 26 #140
-    screenshot = preprocess_image(pyautogui.screenshot(region=(x, y, w, h)))
+    screenshot = preprocess_image(capture_region(get_layout(miner_config), "time_waited", get_lane(miner_config)))
     text = pytesseract.image_to_string(screenshot, config="--psm 7")
     try:
         if text.strip() == "th" or text.strip() == "dh" or text.strip() == "tho":
@@ -144,12 +294,14 @@ def get_time_waited(miner_config):
         raise e
 
 def get_miner_info(miner_config):
-    miner_window_offset = miner_config["miner_window_offset"]
-    x = miner_window_offset["x"] + 50
-    y = miner_window_offset["y"] + 90
-    w = 380
-    h = 130 #140
-    screenshot = pyautogui.screenshot(region=(x, y, w, h))
+    text = devtools_text(miner_config)
+    if text is not None:
+        info = parse_mining_text(text)
+        if 'hashrate' in info:
+            return info
+        logging.warning("Hashrate not found in page text, falling back to OCR")
+
+    screenshot = capture_region(get_layout(miner_config), "info", get_lane(miner_config))
     info = grab_mining_info(screenshot)
     if 'hashrate' not in info:
         screenshot_path = f"{OUTPUT_DIR}/miner_status_{datetime.datetime.now().strftime('%Y-%m-%d_%H-%M-%S')}.png"
@@ -165,36 +317,49 @@ def load_config_from_json(config_path="mining_config.json"):
     for miner in _config["miners"]:
         if "mining_per_cooldown" not in miner:
             miner["mining_per_cooldown"] = 1
+
+    register_profiles(_config.get("layouts", {}))
     return _config
 
 def goto_miner_page_experimental(miner_config):
     logging.info("Going to miner page")
-    x = miner_config["miner_window_offset"]["x"] + 150
-    y = miner_config["miner_window_offset"]["y"] + 250
-    pyautogui.click(x,y);
-    pyautogui.hotkey('command', 'l')
-    pyautogui.typewrite(MINING_URL + "\n")
+    if try_devtools(miner_config, lambda page: page.navigate(MINING_URL) or True, "navigation"):
+        return
+    lane = get_lane(miner_config)
+    with lane.lock:
+        lane.click(**get_layout(miner_config).point("reload_focus"));
+        lane.hotkey(lane.modifier_key, 'l')
+        lane.typewrite(MINING_URL + "\n")
     time.sleep(3) # Allow 3 seconds to reload
     # We might need to re-establish the connection. 
     
 def goto_miner_page(miner_config):
     print("Going to miner page")
-    x = miner_config["miner_window_offset"]["x"] + 50
-    y = miner_config["miner_window_offset"]["y"] + 50
-    pyautogui.click(x,y);
-    pyautogui.scroll(-10);
-    x += 200
-    y += 320
-    pyautogui.moveTo(x,y)
-    pyautogui.click()
+    layout = get_layout(miner_config)
+    lane = get_lane(miner_config)
+    baseline = capture_region(layout, "status", lane)
+    # Follow the in-app link like a user would; a full reload to MINING_URL
+    # is left to goto_miner_page_experimental
+    label = button_labels(miner_config)["miner_link"]
+    if not try_devtools(miner_config, lambda page: page.click_text(label), "click on miner_link"):
+        with lane.lock:
+            lane.click(**layout.point("page_focus"));
+            lane.scroll(-10);
+            lane.move_to(**layout.point("miner_link"))
+            lane.click()
+    # Returns once the miner panel has replaced the previous page
+    wait_for_region_change(miner_config, "status", baseline, "navigate")
 
 def is_miner_page(miner_config):
-    x = miner_config["miner_window_offset"]["x"] + 175
-    y = miner_config["miner_window_offset"]["y"] + 255
-    pyautogui.click(x, y)
-    pyautogui.hotkey('command', 'l')
-    pyautogui.hotkey('command', 'c')
-    url = pyperclip.paste()
+    url = try_devtools(miner_config, lambda page: page.current_url(), "URL read")
+    if url is not None:
+        return url.rstrip('/') == MINING_URL
+    lane = get_lane(miner_config)
+    with lane.lock:
+        lane.click(**get_layout(miner_config).point("url_focus"))
+        lane.hotkey(lane.modifier_key, 'l')
+        lane.hotkey(lane.modifier_key, 'c')
+        url = lane.paste()
     if url == MINING_URL:
         return True
     else: